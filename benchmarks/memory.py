@@ -0,0 +1,33 @@
+import argparse
+import gc
+import tracemalloc
+
+from tasks import CompactTasks, SimpleTasks
+
+
+def measure(tasks_class, size: int) -> int:
+    gc.collect()
+    tracemalloc.start()
+    tasks = tasks_class('benchmark')
+    for i in range(size):
+        task = tasks.add(f'task number {i}')
+        if i % 3 == 0:
+            task.finish()
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tasks
+    return used
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the memory used by the tasks implementations.')
+    parser.add_argument('sizes', nargs='*', type=int, default=[1000, 10000, 100000])
+    args = parser.parse_args()
+    print(f'{"size":>10} {"SimpleTasks":>14} {"CompactTasks":>14} {"ratio":>7}')
+    for size in args.sizes:
+        simple, compact = measure(SimpleTasks, size), measure(CompactTasks, size)
+        print(f'{size:>10} {simple:>14,} {compact:>14,} {simple / compact:>7.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,253 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+from click.testing import CliRunner
+
+from cli_client.client import add, export, finish, list_entries
+from cli_client.factory import ClientManagerFactory
+from exporter.pdf_exporter import PDFExporter
+from exporter.text_exporter import TXTExporter
+from presenter.presenter import TextPresenter
+from storage import CompactJsonStorageFactory, SimpleJsonStorageFactory
+from storage.io import JsonIO
+from storage.parser import SimpleJsonParser
+from tasks import SimpleTasks
+
+SIZES = (1000, 10000, 100000, 1000000)
+BENCHMARKS: Dict[str, 'Benchmark'] = {}
+
+
+class Benchmark:
+    def __init__(self, name: str, setup: Callable[[int, str], Callable[[], object]], max_size: Optional[int] = None):
+        self.name = name
+        self.setup = setup
+        self.max_size = max_size
+
+
+def benchmark(name: str, max_size: Optional[int] = None):
+    def register(setup):
+        BENCHMARKS[name] = Benchmark(name, setup, max_size)
+        return setup
+    return register
+
+
+def task_names(size: int) -> List[str]:
+    return [f'task number {i}' for i in range(size)]
+
+
+def make_tasks(size: int) -> SimpleTasks:
+    tasks = SimpleTasks('benchmark')
+    for i, name in enumerate(task_names(size)):
+        task = tasks.add(name)
+        if i % 3 == 0:
+            task.finish()
+    return tasks
+
+
+@benchmark('tasks.add')
+def tasks_add(size, directory):
+    names = task_names(size)
+
+    def run():
+        tasks = SimpleTasks('benchmark')
+        for name in names:
+            tasks.add(name)
+    return run
+
+
+@benchmark('tasks.getitem_prefix')
+def tasks_getitem_prefix(size, directory):
+    tasks = make_tasks(size)
+    prefixes = [f'task number {i}' for i in range(size - 1, max(size - 1001, -1), -1)]
+
+    def run():
+        for prefix in prefixes:
+            tasks[prefix]
+    return run
+
+
+@benchmark('tasks.delete')
+def tasks_delete(size, directory):
+    names = task_names(size)[::max(size // 1000, 1)]
+
+    def run():
+        tasks = make_tasks(size)
+        for name in names:
+            tasks.delete(name)
+    return run
+
+
+@benchmark('tasks.sort')
+def tasks_sort(size, directory):
+    tasks = make_tasks(size)
+
+    def run():
+        tasks.sort_by_name(desc=True)
+        tasks.all()
+        tasks.sort_by_done_state()
+        tasks.all()
+    return run
+
+
+@benchmark('parser.load')
+def parser_load(size, directory):
+    parser = SimpleJsonParser()
+    content = parser.dump(make_tasks(size))
+    return lambda: parser.load(content)
+
+
+@benchmark('parser.dump')
+def parser_dump(size, directory):
+    parser, tasks = SimpleJsonParser(), make_tasks(size)
+    return lambda: parser.dump(tasks)
+
+
+@benchmark('json_io.save_to')
+def json_io_save_to(size, directory):
+    io, path = JsonIO(), os.path.join(directory, 'group.json')
+    content = SimpleJsonParser().dump(make_tasks(size))
+    return lambda: io.save_to(content, path)
+
+
+@benchmark('json_io.load_from')
+def json_io_load_from(size, directory):
+    io, path = JsonIO(), os.path.join(directory, 'group.json')
+    io.save_to(SimpleJsonParser().dump(make_tasks(size)), path)
+    return lambda: io.load_from(path)
+
+
+@benchmark('storage.put')
+def storage_put(size, directory):
+    storage, tasks = CompactJsonStorageFactory.create(directory), make_tasks(size)
+    return lambda: storage.put(tasks)
+
+
+@benchmark('storage.get')
+def storage_get(size, directory):
+    storage = CompactJsonStorageFactory.create(directory)
+    storage.put(make_tasks(size))
+    return lambda: storage.get('benchmark')
+
+
+@benchmark('presenter.present')
+def presenter_present(size, directory):
+    presenter = TextPresenter(make_tasks(size), max_width=60)
+    return presenter.present
+
+
+@benchmark('exporter.txt')
+def exporter_txt(size, directory):
+    presenter, exporter = TextPresenter(make_tasks(size), max_width=60), TXTExporter(directory, 'benchmark')
+    return lambda: exporter.export(presenter.lines())
+
+
+@benchmark('exporter.pdf', max_size=10000)
+def exporter_pdf(size, directory):
+    presenter, exporter = TextPresenter(make_tasks(size), max_width=60), PDFExporter(directory, 'benchmark')
+    return lambda: exporter.export(presenter.lines())
+
+
+def cli(command, args: List[str]):
+    def setup(size, directory):
+        ClientManagerFactory.create_storage = lambda: SimpleJsonStorageFactory.create(directory)
+        ClientManagerFactory.create_storage().put(make_tasks(size))
+        runner = CliRunner()
+
+        def run():
+            result = runner.invoke(command, args)
+            if result.exit_code:
+                raise RuntimeError(result.output)
+        return run
+    return setup
+
+
+benchmark('cli.add')(cli(add, ['benchmark', 'one', 'more', 'task']))
+benchmark('cli.finish')(cli(finish, ['benchmark', 'task number 1']))
+benchmark('cli.list')(cli(list_entries, ['benchmark']))
+benchmark('cli.list_page')(cli(list_entries, ['benchmark', '-u', '--limit', '50']))
+
+
+@benchmark('cli.export')
+def cli_export(size, directory):
+    return cli(export, ['benchmark', directory])(size, directory)
+
+
+def measure(bench: Benchmark, size: int, repeat: int) -> dict:
+    create_storage = ClientManagerFactory.create_storage
+    with tempfile.TemporaryDirectory() as directory:
+        try:
+            run = bench.setup(size, directory)
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                run()
+                timings.append(time.perf_counter() - start)
+        finally:
+            ClientManagerFactory.create_storage = create_storage
+    return {
+        'name': bench.name,
+        'size': size,
+        'repeat': repeat,
+        'min': min(timings),
+        'median': statistics.median(timings),
+    }
+
+
+def compare(results: List[dict], baseline_path: str, threshold: float) -> List[str]:
+    with open(baseline_path) as file:
+        baseline = {(result['name'], result['size']): result for result in json.load(file)['results']}
+    regressions = []
+    for result in results:
+        previous = baseline.get((result['name'], result['size']))
+        if previous and result['min'] > previous['min'] * (1 + threshold):
+            regressions.append(
+                f"{result['name']}[{result['size']}]: {previous['min']:.4f}s -> {result['min']:.4f}s"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time the tasks, storage, presenter, exporter and cli hot paths.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(SIZES[:3]))
+    parser.add_argument('--only', nargs='+', choices=sorted(BENCHMARKS), help='Run only these benchmarks.')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', '-o', default='benchmark.json', help='Where to write the JSON results.')
+    parser.add_argument('--compare', help='A previous JSON result to check for regressions.')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Allowed slowdown against --compare.')
+    args = parser.parse_args()
+
+    results = []
+    for name in args.only or BENCHMARKS:
+        bench = BENCHMARKS[name]
+        for size in args.sizes:
+            if bench.max_size is not None and size > bench.max_size:
+                continue
+            result = measure(bench, size, args.repeat)
+            results.append(result)
+            print(f"{name:<22} {size:>8} {result['min']:>10.4f}s {result['median']:>10.4f}s", file=sys.stderr)
+
+    with open(args.output, 'w') as file:
+        json.dump({
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'results': results,
+        }, file, indent=4)
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        for regression in regressions:
+            print(f'Regression: {regression}', file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
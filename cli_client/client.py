@@ -1,16 +1,37 @@
+import shlex
+
 import click
 
+import profiler
 from cli_client.factory import ClientManagerFactory
-from exporter.pdf_exporter import PDFExporter
-from exporter.text_exporter import TXTExporter
-from presenter.presenter import TextPresenter
+from tasks import Tasks
 from tasks.errors import UniqueViolationError, ConflictError
 from . import config
 
 
 @click.group(help=config.TASK_HELP)
-def task():
-    pass
+@click.option('--profile', is_flag=True, envvar=config.PROFILE_VARIABLE, help=config.PROFILE_HELP)
+@click.option('--profile-trace', type=click.Path(dir_okay=False), envvar=config.PROFILE_TRACE_VARIABLE,
+              help=config.PROFILE_TRACE_HELP)
+@click.option('--profile-cprofile', type=click.Path(dir_okay=False), envvar=config.PROFILE_CPROFILE_VARIABLE,
+              help=config.PROFILE_CPROFILE_HELP)
+def task(profile, profile_trace, profile_cprofile):
+    if not (profile or profile_trace or profile_cprofile):
+        return
+    import profiler
+
+    profiler.start(profile_cprofile)
+    click.get_current_context().call_on_close(lambda: _report_profile(profile_trace))
+
+
+def _report_profile(trace_path):
+    import profiler
+
+    profile = profiler.stop()
+    if trace_path:
+        profile.dump_trace(trace_path)
+    else:
+        profile.report(click.get_text_stream('stderr'))
 
 
 @task.command(help=config.ADD_HELP)
@@ -36,6 +57,8 @@ def edit(group, entry):
         new_entry = click.prompt(config.EDIT_NEW_NAME_PROMPT.format(entry=full_name), default=full_name)
         task_name = manager.edit_entry(full_name, new_entry)
         click.echo(config.EDIT_SUCCESS.format(entry=full_name, group=group, new_entry=task_name))
+    except UniqueViolationError:
+        click.secho(config.EDIT_FAILED.format(group=group, new_entry=new_entry), fg='red')
     except LookupError:
         click.secho(config.FAILED_LOOKUP.format(entry=entry, group=group), fg='red')
     except ConflictError:
@@ -61,11 +84,48 @@ def remove(group, entry):
 @task.command(name='list', help=config.LIST_HELP)
 @click.argument('group')
 @click.option('--unfinished-tasks', '-u', is_flag=True, help=config.LIST_UNFINISHED)
-def list_entries(group, unfinished_tasks):
-    click.clear()
+@click.option('--limit', '-n', type=click.IntRange(min=1), help=config.LIST_LIMIT)
+@click.option('--offset', type=click.IntRange(min=0), default=0, help=config.LIST_OFFSET)
+@click.option('--cursor', type=click.IntRange(min=0), default=0, help=config.LIST_CURSOR)
+@click.option('--pager', is_flag=True, help=config.LIST_PAGER)
+@click.option('--sort', type=click.Choice(Tasks.ORDERS), default=Tasks.INSERTION_ORDER, help=config.LIST_SORT)
+@click.option('--desc', is_flag=True, help=config.LIST_DESC)
+def list_entries(group, unfinished_tasks, limit, offset, cursor, pager, sort, desc):
+    with profiler.stage(profiler.IMPORT):
+        from presenter.presenter import TextPresenter
+
     tasks = ClientManagerFactory.create(group).retrieve()
-    presentation = TextPresenter(tasks, max_width=60).present(only_unfinished_tasks=unfinished_tasks)
-    click.echo(presentation)
+    presenter = TextPresenter(tasks, max_width=60)
+    next_cursor = None
+    if limit is None and not offset and not cursor and sort == Tasks.INSERTION_ORDER and not desc:
+        lines = presenter.lines(only_unfinished_tasks=unfinished_tasks)
+    else:
+        page, next_cursor = tasks.window(
+            offset, limit, only_unfinished=unfinished_tasks, cursor=cursor, by=sort, desc=desc
+        )
+        lines = presenter.lines(tasks=page)
+    if pager:
+        click.echo_via_pager(f'{line}\n' for line in lines)
+        return
+    click.clear()
+    with profiler.stage(profiler.RENDER):
+        for line in lines:
+            click.echo(line)
+    if next_cursor is not None:
+        options = ' -u' if unfinished_tasks else ''
+        if sort != Tasks.INSERTION_ORDER:
+            options += f' --sort {sort}'
+        if desc:
+            options += ' --desc'
+        click.echo(config.LIST_NEXT_PAGE.format(group=shlex.quote(group), limit=limit, cursor=next_cursor, options=options))
+
+
+@task.command(help=config.STATUS_HELP)
+def status():
+    storage = ClientManagerFactory.create_storage()
+    for name in storage.names():
+        tasks = ClientManagerFactory.create(name, storage).retrieve()
+        click.echo(config.STATUS_LINE.format(group=tasks.name, **tasks.stats()))
 
 
 @task.command(help=config.FINISH_HELP)
@@ -91,17 +151,209 @@ def undo(group, entry):
 
 
 @task.command(help=config.EXPORT_HELP)
-@click.argument('group', nargs=1)
+@click.argument('group', required=False)
 @click.option('--txt', 'format', flag_value='txt', default=True, help=config.EXPORT_TXT_HELP)
 @click.option('--pdf', 'format', flag_value='pdf', help=config.EXPORT_PDF_HELP)
+@click.option('--csv', 'format', flag_value='csv', help=config.EXPORT_CSV_HELP)
+@click.option('--jsonl', 'format', flag_value='jsonl', help=config.EXPORT_JSONL_HELP)
+@click.option('--md', 'format', flag_value='md', help=config.EXPORT_MD_HELP)
+@click.option('--format', 'format_name', help=config.EXPORT_FORMAT_HELP)
 @click.option('--width', 'width', default=60, help=config.EXPORT_WIDTH)
-@click.argument('path', type=click.Path())
-def export(group, format, width, path):
+@click.option('--all', 'all_groups', is_flag=True, help=config.EXPORT_ALL_HELP)
+@click.option('--workers', type=click.IntRange(min=1), help=config.EXPORT_WORKERS_HELP)
+@click.option('--force', is_flag=True, help=config.EXPORT_FORCE_HELP)
+@click.argument('path', type=click.Path(), required=False)
+def export(group, format, format_name, width, all_groups, workers, force, path):
+    from exporter.registry import formats
+
+    if all_groups and path is None:
+        group, path = None, group
+    if path is None or (group is None) != all_groups:
+        raise click.UsageError(config.EXPORT_USAGE)
+    format = format_name or format
+    if format not in formats():
+        raise click.ClickException(config.UNKNOWN_EXPORT_FORMAT.format(format=format, formats=', '.join(formats())))
+    if not all_groups:
+        exported_path, exported = _export_group(group, format, width, path, force)
+        message = config.EXPORT_SUCCESS if exported else config.EXPORT_UNCHANGED
+        click.echo(message.format(group=group, path=exported_path))
+        return
+    _export_all_groups(format, width, path, workers, force)
+
+
+def _export_group(group, format, width, path, force=False):
+    with profiler.stage(profiler.IMPORT):
+        from presenter.presenter import TextPresenter
+        from storage.parser import SimpleJsonParser
+
+        from exporter.abstracts import TasksExporter, fingerprint
+        from exporter.registry import get_exporter
+        exporter_class = get_exporter(format)
+
     tasks = ClientManagerFactory.create(group).retrieve()
-    presentation = TextPresenter(tasks, max_width=width).present()
-    if format == 'pdf':
-        exporter = PDFExporter(path, file_name=group)
-    else:
-        exporter = TXTExporter(path, file_name=group)
-    exporter.export(presentation)
-    click.echo(config.EXPORT_SUCCESS.format(group=group, path=exporter.path))
+    exporter = exporter_class(path, file_name=group)
+    digest = fingerprint(
+        SimpleJsonParser(compact=True).dump(tasks),
+        format=format, width=width, exporter=f'{exporter_class.__module__}.{exporter_class.__qualname__}'
+    )
+    if not force and exporter.is_current(digest):
+        return exporter.path, False
+    exporter.forget_fingerprint()
+    content = tasks if issubclass(exporter_class, TasksExporter) else TextPresenter(tasks, max_width=width).lines()
+    with profiler.stage(profiler.EXPORT):
+        exporter.export(content)
+    exporter.save_fingerprint(digest)
+    return exporter.path, True
+
+
+def _export_all_groups(format, width, path, workers, force=False):
+    from concurrent.futures import ProcessPoolExecutor
+
+    if ClientManagerFactory.shared_storage is not None:
+        ClientManagerFactory.shared_storage.flush()
+    groups = ClientManagerFactory.create_storage().names()
+    failed = unchanged = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_export_group, group, format, width, path, force) for group in groups]
+        for group, future in zip(groups, futures):
+            try:
+                exported_path, exported = future.result()
+            except Exception as error:
+                failed += 1
+                click.secho(config.EXPORT_FAILED.format(group=group, error=error), fg='red')
+            else:
+                unchanged += not exported
+                message = config.EXPORT_SUCCESS if exported else config.EXPORT_UNCHANGED
+                click.echo(message.format(group=group, path=exported_path))
+    click.echo(config.EXPORT_SUMMARY.format(
+        exported=len(groups) - failed - unchanged, total=len(groups), path=path, unchanged=unchanged
+    ))
+    if failed:
+        click.get_current_context().exit(1)
+
+
+@task.command(help=config.BATCH_HELP)
+@click.argument('operations', type=click.File(), default='-')
+def batch(operations):
+    from storage.storage import WriteBehindStorage
+
+    storage = ClientManagerFactory.shared_storage or WriteBehindStorage(ClientManagerFactory.create_storage())
+    managers = {}
+    applied = total = 0
+    adding_group, adding = None, []
+    for line_number, line in enumerate(operations, start=1):
+        if not line.strip() or line.lstrip().startswith('#'):
+            continue
+        total += 1
+        try:
+            operation, group, *words = shlex.split(line)
+        except ValueError:
+            operation, group, words = line.strip(), None, []
+        if adding and (operation != 'add' or group != adding_group):
+            applied += _batch_add(managers[adding_group], adding_group, adding)
+            adding = []
+        if operation not in BATCH_COMMANDS or not words or (operation == 'edit' and len(words) < 2):
+            click.secho(config.BATCH_INVALID_LINE.format(line=line_number, operation=line.strip()), fg='red')
+            continue
+        if group not in managers:
+            managers[group] = ClientManagerFactory.create(group, storage)
+        if operation == 'add':
+            adding_group = group
+            adding.append(' '.join(words))
+            continue
+        message, succeeded = BATCH_OPERATIONS[operation](managers[group], group, words)
+        click.secho(message, fg=None if succeeded else 'red')
+        applied += succeeded
+    if adding:
+        applied += _batch_add(managers[adding_group], adding_group, adding)
+    storage.flush()
+    click.echo(config.BATCH_SUMMARY.format(applied=applied, total=total))
+
+
+def _batch_add(manager, group, entries):
+    unique = list(dict.fromkeys(entries))
+    try:
+        manager.add_entries(unique)
+        duplicates = set()
+    except UniqueViolationError as error:
+        duplicates = set(error.names)
+        manager.add_entries([entry for entry in unique if entry not in duplicates])
+    applied, seen = 0, set()
+    for entry in entries:
+        if entry in duplicates or entry in seen:
+            click.secho(config.ADD_FAILED.format(group=group, entry=entry), fg='red')
+        else:
+            click.echo(config.ADD_SUCCESS.format(group=group, entry=entry))
+            applied += 1
+        seen.add(entry)
+    return applied
+
+
+def _batch_edit(manager, group, words):
+    entry, new_entry = words[0], ' '.join(words[1:])
+    try:
+        full_name = manager.get_entry_full_name(partial_name=entry)
+        manager.edit_entry(full_name, new_entry)
+        return config.EDIT_SUCCESS.format(entry=full_name, group=group, new_entry=new_entry), True
+    except UniqueViolationError:
+        return config.EDIT_FAILED.format(group=group, new_entry=new_entry), False
+    except LookupError:
+        return config.FAILED_LOOKUP.format(entry=entry, group=group), False
+    except ConflictError:
+        return config.CONFLICTING_ENTRIES.format(entry=entry, group=group), False
+
+
+def _batch_remove(manager, group, words):
+    entry = ' '.join(words)
+    try:
+        full_name = manager.get_entry_full_name(partial_name=entry)
+        manager.delete_entry(full_name)
+        return config.REMOVE_SUCCESS.format(entry=full_name, group=group), True
+    except LookupError:
+        return config.FAILED_LOOKUP.format(entry=entry, group=group), False
+    except ConflictError:
+        return config.CONFLICTING_ENTRIES.format(entry=entry, group=group), False
+
+
+def _batch_finish_or_undo(method_name, success_message):
+    def apply(manager, group, words):
+        entry = ' '.join(words)
+        try:
+            full_name = manager.get_entry_full_name(entry)
+        except LookupError:
+            full_name = entry
+        except ConflictError:
+            return config.CONFLICTING_ENTRIES.format(entry=entry, group=group), False
+        getattr(manager, method_name)(full_name)
+        return success_message.format(entry=full_name), True
+
+    return apply
+
+
+BATCH_OPERATIONS = {
+    'edit': _batch_edit,
+    'remove': _batch_remove,
+    'finish': _batch_finish_or_undo('finish_entry', config.FINISH_SUCCESS),
+    'undo': _batch_finish_or_undo('undo_entry', config.UNDO_SUCCESS),
+}
+BATCH_COMMANDS = {'add', *BATCH_OPERATIONS}
+
+
+@task.command(help=config.SERVE_HELP)
+@click.option('--flush-interval', default=2.0, help=config.SERVE_FLUSH_INTERVAL)
+@click.option('--stop', is_flag=True, help=config.SERVE_STOP)
+def serve(flush_interval, stop):
+    from cli_client import daemon
+
+    socket_path = daemon.default_socket_path()
+    if stop:
+        if daemon.request({'command': 'stop'}, socket_path) is None:
+            click.secho(config.SERVE_NOT_RUNNING.format(socket_path=socket_path), fg='red')
+        else:
+            click.echo(config.SERVE_STOPPED)
+        return
+    click.echo(config.SERVE_STARTED.format(socket_path=socket_path))
+    try:
+        daemon.serve(socket_path, flush_interval)
+    except RuntimeError as error:
+        click.secho(str(error), fg='red')
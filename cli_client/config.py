@@ -7,6 +7,7 @@ ADD_FAILED = 'Entry {entry} already in {group}!'
 EDIT_HELP = 'Edit an entry in a specific group (prefix matches are valid).'
 EDIT_NEW_NAME_PROMPT = 'Enter the new name for {entry}'
 EDIT_SUCCESS = 'Entry {entry} in {group} changed to {new_entry}.'
+EDIT_FAILED = 'Entry {new_entry} already in {group}!'
 
 REMOVE_HELP = 'Remove an entry from a specific group (prefix matches are valid).'
 REMOVE_SUCCESS = 'Entry {entry} in {group} removed.'
@@ -22,9 +23,56 @@ GROUP_HELP = 'Add a group of tasks.'
 
 LIST_HELP = 'List all the entries in a group.'
 LIST_UNFINISHED = 'List only the unfinished entries.'
+LIST_LIMIT = 'Show at most this many entries.'
+LIST_OFFSET = 'Skip this many entries before the first one shown.'
+LIST_CURSOR = 'Resume listing from a cursor printed by a previous page.'
+LIST_PAGER = 'Show the entries in a pager, rendering them as you scroll.'
+LIST_SORT = 'Order the entries by insertion, name or done state.'
+LIST_DESC = 'Reverse the chosen order.'
+LIST_NEXT_PAGE = 'Next page: task list {group}{options} --limit {limit} --cursor {cursor}'
+
+STATUS_HELP = 'Show how many entries are left in every group.'
+STATUS_LINE = '{group}: {unfinished} left, {finished} finished, {total} total'
 
 EXPORT_HELP = 'Export the tasks group to txt/pdf format.'
 EXPORT_TXT_HELP = 'Export to .txt file (default)'
 EXPORT_PDF_HELP = 'Export to .pdf file'
+EXPORT_CSV_HELP = 'Export to .csv file with name and done columns'
+EXPORT_JSONL_HELP = 'Export to .jsonl file with one task per line'
+EXPORT_MD_HELP = 'Export to .md file as a Markdown checklist'
+EXPORT_FORMAT_HELP = 'Export with the exporter registered under this name (including plugins).'
+UNKNOWN_EXPORT_FORMAT = 'Unknown export format {format} (available formats: {formats})!'
 EXPORT_WIDTH = 'Width used for lines of the exported file.'
 EXPORT_SUCCESS = '{group} exported to {path}'
+EXPORT_ALL_HELP = 'Export every group into PATH, one file per group.'
+EXPORT_WORKERS_HELP = 'Number of processes exporting groups in parallel (defaults to the number of CPUs).'
+EXPORT_USAGE = 'Give either a GROUP and a PATH, or --all and a PATH.'
+EXPORT_FAILED = 'Exporting {group} failed: {error}'
+EXPORT_SUMMARY = '{exported} of {total} groups exported to {path}, {unchanged} unchanged.'
+EXPORT_FORCE_HELP = 'Export even when the group and options match the last export.'
+EXPORT_UNCHANGED = '{group} is unchanged since the last export to {path}'
+
+STORAGE_ENGINE_VARIABLE = 'TASK_STORAGE_ENGINE'
+PARSE_CACHE_VARIABLE = 'TASK_PARSE_CACHE'
+DEFAULT_STORAGE_ENGINE = 'compact-json'
+UNKNOWN_STORAGE_ENGINE = 'Unknown storage engine {engine} (available engines: {engines})!'
+
+BATCH_HELP = 'Apply add/edit/remove/finish/undo operations read line by line from a file or stdin.'
+BATCH_INVALID_LINE = 'Line {line} is not a valid operation: {operation}'
+BATCH_SUMMARY = '{applied} of {total} operations applied.'
+
+SERVE_HELP = 'Run a background server that keeps groups in memory for faster commands.'
+SERVE_FLUSH_INTERVAL = 'Seconds between writes of pending changes to the storage.'
+SERVE_STOP = 'Stop the running server.'
+SERVE_STARTED = 'Serving on {socket_path}.'
+SERVE_STOPPED = 'Server stopped.'
+SERVE_NOT_RUNNING = 'No server is running on {socket_path}!'
+SERVE_ALREADY_RUNNING = 'A server is already running on {socket_path}!'
+SOCKET_VARIABLE = 'TASK_SOCKET'
+
+PROFILE_VARIABLE = 'TASK_PROFILE'
+PROFILE_TRACE_VARIABLE = 'TASK_PROFILE_TRACE'
+PROFILE_CPROFILE_VARIABLE = 'TASK_PROFILE_CPROFILE'
+PROFILE_HELP = 'Report the time and allocated memory blocks of each stage to stderr.'
+PROFILE_TRACE_HELP = 'Write the stage report as JSON to this file instead.'
+PROFILE_CPROFILE_HELP = 'Also dump cProfile statistics to this file.'
@@ -0,0 +1,149 @@
+import getpass
+import json
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+from typing import List, Optional
+
+from . import config
+
+NOT_FORWARDED_COMMANDS = {'edit', 'serve'}
+PROFILE_VARIABLES = (config.PROFILE_VARIABLE, config.PROFILE_TRACE_VARIABLE, config.PROFILE_CPROFILE_VARIABLE)
+CLEAR_SCREEN = '\033[2J\033[1;1H'
+
+
+def default_socket_path() -> str:
+    if os.environ.get(config.SOCKET_VARIABLE):
+        return os.environ[config.SOCKET_VARIABLE]
+    try:
+        user = getpass.getuser()
+    except (KeyError, OSError):
+        user = str(os.getuid())
+    return os.path.join(os.environ.get('XDG_RUNTIME_DIR') or '/tmp', f'task-{user}.sock')
+
+
+def _send(connection: socket.socket, message: dict):
+    connection.sendall(json.dumps(message).encode() + b'\n')
+
+
+def _receive(connection: socket.socket) -> dict:
+    with connection.makefile('rb') as file:
+        return json.loads(file.readline())
+
+
+def request(message: dict, socket_path: Optional[str] = None, timeout: float = 60) -> Optional[dict]:
+    socket_path = socket_path or default_socket_path()
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.settimeout(timeout)
+    try:
+        client.connect(socket_path)
+    except (FileNotFoundError, ConnectionRefusedError):
+        client.close()
+        return None
+    with client:
+        _send(client, message)
+        return _receive(client)
+
+
+def forward(args: List[str], socket_path: Optional[str] = None) -> Optional[dict]:
+    return request({'args': args, 'cwd': os.getcwd(), 'color': sys.stdout.isatty()}, socket_path)
+
+
+def is_forwarded(args: List[str]) -> bool:
+    if any(os.environ.get(variable) for variable in PROFILE_VARIABLES):
+        return False
+    if not args:
+        return True
+    if args[0].startswith('--profile'):
+        return False
+    if args[0] == 'batch':
+        return len(args) > 1 and args[1] != '-'
+    return args[0] not in NOT_FORWARDED_COMMANDS
+
+
+def main():
+    args = sys.argv[1:]
+    command = args[0] if args else None
+    if is_forwarded(args):
+        response = forward(args)
+        if response is not None:
+            if command == 'list' and sys.stdout.isatty():
+                sys.stdout.write(CLEAR_SCREEN)
+            sys.stdout.write(response['output'])
+            sys.exit(response['exit_code'])
+    elif command != 'serve':
+        request({'command': 'release'})
+
+    from .client import task
+    task()
+
+
+def serve(socket_path: Optional[str] = None, flush_interval: float = 2.0):
+    from click.testing import CliRunner
+
+    from storage.storage import WriteBehindStorage
+    from .client import task
+    from .factory import ClientManagerFactory
+
+    socket_path = socket_path or default_socket_path()
+    if request({'command': 'ping'}, socket_path) is not None:
+        raise RuntimeError(config.SERVE_ALREADY_RUNNING.format(socket_path=socket_path))
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+    storage = WriteBehindStorage(ClientManagerFactory.create_storage(compact_tasks=True))
+    ClientManagerFactory.shared_storage = storage
+    runner = CliRunner()
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(socket_path)
+    server.listen()
+    server.settimeout(flush_interval)
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+    dirty_since = None
+    try:
+        while True:
+            try:
+                connection, _ = server.accept()
+            except socket.timeout:
+                connection = None
+            if connection is not None:
+                with connection:
+                    try:
+                        message = _receive(connection)
+                    except (OSError, ValueError):
+                        continue
+                    command = message.get('command')
+                    if command == 'stop':
+                        _send(connection, {})
+                        break
+                    if command == 'release':
+                        storage.release()
+                        _send(connection, {})
+                    elif command == 'ping':
+                        _send(connection, {})
+                    else:
+                        _send(connection, _run(runner, task, message))
+            if storage.pending:
+                dirty_since = dirty_since or time.monotonic()
+                if time.monotonic() - dirty_since >= flush_interval:
+                    storage.flush()
+                    dirty_since = None
+    except KeyboardInterrupt:
+        pass
+    finally:
+        storage.flush()
+        ClientManagerFactory.shared_storage = None
+        server.close()
+        os.remove(socket_path)
+
+
+def _run(runner, command, message: dict) -> dict:
+    os.chdir(message['cwd'])
+    result = runner.invoke(command, message['args'], color=message['color'])
+    output = result.output
+    if result.exception is not None and not isinstance(result.exception, SystemExit):
+        output += f'{type(result.exception).__name__}: {result.exception}\n'
+    return {'output': output, 'exit_code': result.exit_code}
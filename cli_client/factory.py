@@ -1,12 +1,43 @@
+import os
+from typing import Optional
+
 import click
 
 from manager.abstract import ManagerFactory
 from manager.manager import SimpleTasksManager
-from storage import SimpleJsonStorageFactory
+from storage import (
+    SimpleJsonStorageFactory, CompactJsonStorageFactory, SqliteStorageFactory, JournalStorageFactory,
+    BinaryStorageFactory
+)
+from storage.storage import CachedStorage, Storage
+from . import config
+
+STORAGE_FACTORIES = {
+    'json': SimpleJsonStorageFactory,
+    'compact-json': CompactJsonStorageFactory,
+    'sqlite': SqliteStorageFactory,
+    'journal': JournalStorageFactory,
+    'binary': BinaryStorageFactory,
+}
 
 
 class ClientManagerFactory(ManagerFactory):
+    shared_storage: Optional[Storage] = None
+
+    @staticmethod
+    def create(name: str, storage: Optional[Storage] = None):
+        storage = storage or ClientManagerFactory.shared_storage or CachedStorage(
+            ClientManagerFactory.create_storage()
+        )
+        return SimpleTasksManager(name, storage)
+
     @staticmethod
-    def create(name: str):
+    def create_storage(compact_tasks: bool = False) -> Storage:
         storage_path = click.get_app_dir('tasks')
-        return SimpleTasksManager(name, SimpleJsonStorageFactory().create(storage_path))
+        engine = os.environ.get(config.STORAGE_ENGINE_VARIABLE, config.DEFAULT_STORAGE_ENGINE)
+        if engine not in STORAGE_FACTORIES:
+            raise click.ClickException(config.UNKNOWN_STORAGE_ENGINE.format(
+                engine=engine, engines=', '.join(STORAGE_FACTORIES)
+            ))
+        parse_cache = bool(os.environ.get(config.PARSE_CACHE_VARIABLE))
+        return STORAGE_FACTORIES[engine].create(storage_path, parse_cache, compact_tasks)
@@ -1,5 +1,15 @@
+import hashlib
+import json
 import os
 from abc import ABC, abstractmethod
+from typing import TextIO
+
+from tasks import Tasks
+
+
+def fingerprint(content, **options) -> str:
+    payload = json.dumps([content, options], sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode()).hexdigest()
 
 
 class Exporter(ABC):
@@ -10,6 +20,29 @@ class Exporter(ABC):
             os.makedirs(path)
         self.path = os.path.join(path, f'{file_name}.{self.extension}')
 
+    @property
+    def fingerprint_path(self):
+        return self.path + '.fingerprint'
+
+    def is_current(self, fingerprint: str) -> bool:
+        if not os.path.isfile(self.path):
+            return False
+        try:
+            with open(self.fingerprint_path) as file:
+                return file.read() == fingerprint
+        except OSError:
+            return False
+
+    def forget_fingerprint(self):
+        try:
+            os.remove(self.fingerprint_path)
+        except FileNotFoundError:
+            pass
+
+    def save_fingerprint(self, fingerprint: str):
+        with open(self.fingerprint_path, 'w') as file:
+            file.write(fingerprint)
+
     @abstractmethod
     def export(self, content: str, **kwargs):
         pass
@@ -18,3 +51,13 @@ class Exporter(ABC):
     @abstractmethod
     def extension(self):
         pass
+
+
+class TasksExporter(Exporter, ABC):
+    def export(self, content: Tasks, **kwargs):
+        with open(self.path, 'w', newline='', encoding='utf-8') as file:
+            self.write(content, file)
+
+    @abstractmethod
+    def write(self, tasks: Tasks, file: TextIO):
+        pass
@@ -0,0 +1,16 @@
+import csv
+from typing import TextIO
+
+from exporter.abstracts import TasksExporter
+from tasks import Tasks
+
+
+class CSVExporter(TasksExporter):
+    def write(self, tasks: Tasks, file: TextIO):
+        writer = csv.writer(file)
+        writer.writerow(['name', 'done'])
+        writer.writerows((task.name, int(task.done)) for task in tasks.all())
+
+    @property
+    def extension(self):
+        return 'csv'
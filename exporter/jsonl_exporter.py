@@ -0,0 +1,15 @@
+import json
+from typing import TextIO
+
+from exporter.abstracts import TasksExporter
+from tasks import Tasks
+
+
+class JSONLExporter(TasksExporter):
+    def write(self, tasks: Tasks, file: TextIO):
+        encode = json.JSONEncoder(ensure_ascii=False).encode
+        file.writelines(encode({'name': task.name, 'done': task.done}) + '\n' for task in tasks.all())
+
+    @property
+    def extension(self):
+        return 'jsonl'
@@ -0,0 +1,21 @@
+import re
+from typing import TextIO
+
+from exporter.abstracts import TasksExporter
+from tasks import Tasks
+
+SPECIAL_CHARACTERS = re.compile(r'([\\`*_\[\]<>#|])')
+
+
+class MarkdownExporter(TasksExporter):
+    def write(self, tasks: Tasks, file: TextIO):
+        file.write(f'# {self.escape(tasks.name.title())}\n\n')
+        file.writelines(f"- [{'x' if task.done else ' '}] {self.escape(task.name)}\n" for task in tasks.all())
+
+    @staticmethod
+    def escape(text: str) -> str:
+        return SPECIAL_CHARACTERS.sub(r'\\\1', text)
+
+    @property
+    def extension(self):
+        return 'md'
@@ -1,21 +1,136 @@
+import hashlib
+import marshal
 import os
 import pathlib
+import re
+import tempfile
+from typing import Dict, Iterable, Optional, Tuple, Union
 
 from fpdf import FPDF
+from fpdf.ttfonts import TTFontFile
 
 from exporter.abstracts import Exporter
 
 HERE = pathlib.Path(__file__).parent
+FONT_PATH = os.path.abspath(os.path.join(HERE, '../assets/fonts/onuava__.ttf'))
 
 
-class PDFExporter(Exporter):
-    def export(self, content: str, **kwargs):
-        font_size = kwargs.get('font_size', 12)
+def user_cache_dir() -> str:
+    if os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'tasks')
+
+
+class FontMetrics:
+    VERSION = 1
+    _loaded: Dict[Tuple[str, int, int], dict] = {}
+
+    def __init__(self, font_path: str = FONT_PATH, cache_dir: Optional[str] = None):
+        self.font_path = os.path.abspath(font_path)
+        self.cache_dir = cache_dir if cache_dir is not None else os.path.join(user_cache_dir(), 'fonts')
+
+    def load(self) -> dict:
+        stat = os.stat(self.font_path)
+        key = (self.font_path, stat.st_mtime_ns, stat.st_size)
+        if key not in self._loaded:
+            with open(self.font_path, 'rb') as file:
+                digest = hashlib.sha256(file.read()).hexdigest()
+            cache_path = os.path.join(self.cache_dir, f'{digest}.metrics')
+            metrics = self._read(cache_path)
+            if metrics is None:
+                metrics = self._parse()
+                self._write(metrics, cache_path)
+            self._loaded[key] = metrics
+        return self._loaded[key]
+
+    def register(self, pdf: FPDF, family: str):
+        font_key = family.lower()
+        if font_key in pdf.fonts:
+            return
+        metrics = self.load()
+        pdf.fonts[font_key] = {
+            'i': len(pdf.fonts) + 1, 'type': 'TTF', 'name': metrics['name'], 'desc': metrics['desc'],
+            'up': metrics['up'], 'ut': metrics['ut'], 'cw': metrics['cw'], 'ttffile': self.font_path,
+            'fontkey': font_key, 'subset': list(range(57 if hasattr(pdf, 'str_alias_nb_pages') else 32)),
+            'unifilename': None,
+        }
+        pdf.font_files[font_key] = {'length1': metrics['originalsize'], 'type': 'TTF', 'ttffile': self.font_path}
+        pdf.font_files[self.font_path] = {'type': 'TTF'}
+
+    def _parse(self) -> dict:
+        ttf = TTFontFile()
+        ttf.getMetrics(self.font_path)
+        return {
+            'name': re.sub('[ ()]', '', ttf.fullName),
+            'desc': {
+                'Ascent': int(round(ttf.ascent, 0)),
+                'Descent': int(round(ttf.descent, 0)),
+                'CapHeight': int(round(ttf.capHeight, 0)),
+                'Flags': ttf.flags,
+                'FontBBox': '[%s %s %s %s]' % tuple(int(round(value, 0)) for value in ttf.bbox),
+                'ItalicAngle': int(ttf.italicAngle),
+                'StemV': int(round(ttf.stemV, 0)),
+                'MissingWidth': int(round(ttf.defaultWidth, 0)),
+            },
+            'up': round(ttf.underlinePosition),
+            'ut': round(ttf.underlineThickness),
+            'originalsize': os.path.getsize(self.font_path),
+            'cw': ttf.charWidths,
+        }
+
+    def _read(self, cache_path: str) -> Optional[dict]:
+        try:
+            with open(cache_path, 'rb') as file:
+                version, metrics = marshal.loads(file.read())
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        return metrics if version == self.VERSION else None
+
+    def _write(self, metrics: dict, cache_path: str):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            descriptor, temporary_path = tempfile.mkstemp(dir=self.cache_dir, prefix='.', suffix='.tmp')
+            with os.fdopen(descriptor, 'wb') as file:
+                file.write(marshal.dumps((self.VERSION, metrics)))
+            os.replace(temporary_path, cache_path)
+        except OSError:
+            pass
+
+
+class PDFContext:
+    def __init__(self, font_size: int = 12, family: str = 'Onuava', metrics: Optional[FontMetrics] = None):
+        self.font_size = font_size
+        self.family = family
+        self.metrics = metrics or FontMetrics()
+
+    def document(self, font_size: Optional[int] = None) -> FPDF:
         pdf = FPDF()
         pdf.add_page()
-        pdf.add_font('Onuava', '', os.path.join(HERE, '../assets/fonts/onuava__.ttf'), uni=True)
-        pdf.set_font('Onuava', size=font_size)
-        pdf.multi_cell(0, 10, content)
+        self.metrics.register(pdf, self.family)
+        pdf.set_font(self.family, size=font_size or self.font_size)
+        return pdf
+
+
+default_context = PDFContext()
+
+
+class PDFExporter(Exporter):
+    LINE_HEIGHT = 10
+
+    def __init__(self, path: str, file_name: str, context: PDFContext = None):
+        super().__init__(path, file_name)
+        self.context = context or default_context
+
+    def export(self, content: Union[str, Iterable[str]], **kwargs):
+        pdf = self.context.document(kwargs.get('font_size'))
+        width = pdf.w - pdf.l_margin - pdf.r_margin - 2 * pdf.c_margin
+        for line in content.split('\n') if isinstance(content, str) else content:
+            if pdf.get_string_width(line) > width:
+                pdf.multi_cell(0, self.LINE_HEIGHT, line)
+            else:
+                pdf.cell(0, self.LINE_HEIGHT, line, ln=1)
         pdf.output(self.path, 'F')
 
     @property
@@ -0,0 +1,42 @@
+from importlib import import_module
+from typing import Dict, List, Type
+
+from exporter.abstracts import Exporter
+
+ENTRY_POINT_GROUP = 'task.exporters'
+BUILTIN_EXPORTERS = {
+    'txt': 'exporter.text_exporter:TXTExporter',
+    'pdf': 'exporter.pdf_exporter:PDFExporter',
+    'csv': 'exporter.csv_exporter:CSVExporter',
+    'jsonl': 'exporter.jsonl_exporter:JSONLExporter',
+    'md': 'exporter.markdown_exporter:MarkdownExporter',
+}
+
+
+def _entry_points() -> Dict[str, str]:
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:  # pragma: no cover
+        return {}
+    found = entry_points()
+    if hasattr(found, 'select'):
+        found = found.select(group=ENTRY_POINT_GROUP)
+    else:  # pragma: no cover
+        found = found.get(ENTRY_POINT_GROUP, [])
+    return {entry_point.name: entry_point.value for entry_point in found}
+
+
+def exporters() -> Dict[str, str]:
+    return {**BUILTIN_EXPORTERS, **_entry_points()}
+
+
+def formats() -> List[str]:
+    return sorted(exporters())
+
+
+def get_exporter(name: str) -> Type[Exporter]:
+    target = exporters().get(name)
+    if target is None:
+        raise LookupError(f'No exporter registered for {name}!')
+    module_name, _, class_name = target.partition(':')
+    return getattr(import_module(module_name), class_name)
@@ -1,10 +1,16 @@
+from typing import Iterable, Union
+
 from exporter.abstracts import Exporter
 
 
 class TXTExporter(Exporter):
-    def export(self, content: str, **kwargs):
+    def export(self, content: Union[str, Iterable[str]], **kwargs):
         with open(self.path, 'w') as file:
-            file.write(content)
+            if isinstance(content, str):
+                file.write(content)
+                return
+            for index, line in enumerate(content):
+                file.write(f'\n{line}' if index else line)
 
     @property
     def extension(self):
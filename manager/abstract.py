@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import List
 
 from storage.storage import Storage
 from tasks import Tasks
@@ -16,6 +17,9 @@ class TasksManager(ABC):
     def add_entry(self, entry: str) -> str:
         pass
 
+    def add_entries(self, entries: List[str]) -> List[str]:
+        return [self.add_entry(entry) for entry in entries]
+
     @abstractmethod
     def delete_entry(self, entry: str) -> str:
         pass
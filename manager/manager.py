@@ -1,3 +1,7 @@
+from contextlib import contextmanager
+from typing import List
+
+import profiler
 from storage.storage import Storage
 from tasks import SimpleTasks
 from .abstract import TasksManager
@@ -7,49 +11,118 @@ class SimpleTasksManager(TasksManager):
     def __init__(self, name: str, storage: Storage):
         self._tasks_name = name
         self._tasks = None
+        self._signature = None
+        self._in_transaction = False
+        self._changed = False
         self.storage = storage
 
     def get_entry_full_name(self, partial_name):
         tasks = self.retrieve()
-        return tasks[partial_name].name
+        with profiler.stage(profiler.LOOKUP):
+            return tasks[partial_name].name
 
     def add_entry(self, entry: str) -> str:
-        tasks = self.retrieve()
-        tasks.add(entry)
-        self.storage.put(tasks)
+        with self._locked() as tasks:
+            with profiler.stage(profiler.MUTATE):
+                tasks.add(entry)
+            self._persist(self.storage.put_task, tasks, entry)
         return tasks[entry].name
 
+    def add_entries(self, entries: List[str]) -> List[str]:
+        with self._locked() as tasks:
+            with profiler.stage(profiler.MUTATE):
+                tasks.extend((entry, False) for entry in entries)
+            self._persist(self.storage.put, tasks)
+        return entries
+
     def edit_entry(self, entry: str, new_entry: str) -> str:
-        tasks = self.retrieve()
-        tasks[entry] = new_entry
-        self.storage.put(tasks)
+        with self._locked() as tasks:
+            with profiler.stage(profiler.LOOKUP):
+                full_name = tasks[entry].name
+            with profiler.stage(profiler.MUTATE):
+                tasks[full_name] = new_entry
+            self._persist(self.storage.rename_task, tasks, full_name, new_entry)
         return new_entry
 
     def delete_entry(self, entry: str) -> None:
-        tasks = self.retrieve()
-        tasks.delete(entry)
-        self.storage.put(tasks)
+        with self._locked() as tasks:
+            with profiler.stage(profiler.LOOKUP):
+                full_name = tasks[entry].name
+            with profiler.stage(profiler.MUTATE):
+                tasks.delete(full_name)
+            self._persist(self.storage.delete_task, tasks, full_name)
 
     def finish_entry(self, entry: str) -> str:
-        tasks = self.retrieve()
-        if tasks.has(entry):
-            tasks[entry].finish()
-        else:
-            task = tasks.add(entry)
-            task.finish()
-        self.storage.put(tasks)
+        with self._locked() as tasks:
+            with profiler.stage(profiler.MUTATE):
+                if tasks.has(entry):
+                    tasks[entry].finish()
+                else:
+                    task = tasks.add(entry)
+                    task.finish()
+            self._persist(self.storage.put_task, tasks, entry)
         return tasks[entry].name
 
     def undo_entry(self, entry: str) -> str:
-        tasks = self.retrieve()
-        if tasks.has(entry):
-            tasks[entry].undo()
-        else:
-            tasks.add(entry)
-        self.storage.put(tasks)
+        with self._locked() as tasks:
+            with profiler.stage(profiler.MUTATE):
+                if tasks.has(entry):
+                    tasks[entry].undo()
+                else:
+                    tasks.add(entry)
+            self._persist(self.storage.put_task, tasks, entry)
         return tasks[entry].name
 
     def retrieve(self) -> SimpleTasks:
         if self._tasks is None:
+            self._signature = self.storage.signature(self._tasks_name)
             self._tasks = self.storage.get(self._tasks_name)
         return self._tasks
+
+    def _refresh(self) -> SimpleTasks:
+        current = self.storage.signature(self._tasks_name)
+        if current[0] is None or current != self._signature:
+            self._tasks = None
+        return self.retrieve()
+
+    @contextmanager
+    def transaction(self):
+        if self._in_transaction:
+            yield self
+            return
+        with self.storage.lock(self._tasks_name):
+            self._refresh()
+            self._in_transaction = True
+            self._changed = False
+            try:
+                yield self
+                if self._changed:
+                    self.storage.put(self.retrieve())
+                    self._signature = self.storage.signature(self._tasks_name)
+            except BaseException:
+                self._tasks = None
+                self.storage.invalidate(self._tasks_name)
+                raise
+            finally:
+                self._in_transaction = False
+
+    @contextmanager
+    def _locked(self):
+        if self._in_transaction:
+            yield self.retrieve() if self._changed else self._refresh()
+            return
+        with self.storage.lock(self._tasks_name):
+            try:
+                yield self._refresh()
+            except BaseException:
+                self._tasks = None
+                self.storage.invalidate(self._tasks_name)
+                raise
+
+    def _persist(self, write, *args):
+        if self._in_transaction:
+            self._changed = True
+        else:
+            with profiler.stage(profiler.WRITE):
+                write(*args)
+            self._signature = self.storage.signature(self._tasks_name)
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
+from typing import Iterator, List, Optional
 
-from tasks import Tasks
+from tasks import Task, Tasks
 
 
 class Presenter(ABC):
@@ -10,3 +11,7 @@ class Presenter(ABC):
     @abstractmethod
     def present(self, only_unfinished_tasks=False):
         pass
+
+    @abstractmethod
+    def lines(self, only_unfinished_tasks=False, tasks: Optional[List[Task]] = None) -> Iterator[str]:
+        pass
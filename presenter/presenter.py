@@ -1,3 +1,5 @@
+from typing import Iterable, Iterator, List, Optional
+
 from presenter.abstract import Presenter
 from tasks import Tasks, Task
 
@@ -10,6 +12,9 @@ class TextPresenter(Presenter):
         self._width = None
 
     def present_task(self, task: Task):
+        return '\n'.join(self.task_lines(task))
+
+    def task_lines(self, task: Task) -> List[str]:
         name = task.name
         chunks = []
         while name:
@@ -17,28 +22,47 @@ class TextPresenter(Presenter):
             name = name[self.max_width - 4:]
         status = f"[{[' ', 'x'][task.done]}] "
         chunks[0] = status + chunks[0][4:]
-        return '\n'.join(chunks)
+        return chunks
 
     def present(self, only_unfinished_tasks=False):
-        output = f'{self.title}\n{self.line}'
+        width = len(self.title)
+        lines = []
         for task in self.tasks.all():
-            if only_unfinished_tasks and task.done:
-                continue
-            output = f'{output}\n{self.present_task(task)}'
-        return f'{output}\n{self.line}'
+            task_lines = self.task_lines(task)
+            width = max(width, max(map(len, task_lines)))
+            if not (only_unfinished_tasks and task.done):
+                lines.extend(task_lines)
+        self._width = width
+        return '\n'.join([self.title, self.line, *lines, self.line])
+
+    def lines(self, only_unfinished_tasks=False, tasks: Optional[List[Task]] = None) -> Iterator[str]:
+        line = self.line if tasks is None else '=' * self.measure(tasks)
+        yield self.title
+        yield line
+        if tasks is None:
+            tasks = self.tasks.unfinished() if only_unfinished_tasks else self.tasks.all()
+        for task in tasks:
+            if not (only_unfinished_tasks and task.done):
+                yield from self.task_lines(task)
+        yield line
+
+    def task_width(self, task: Task) -> int:
+        name, step = task.name, self.max_width - 4
+        if len(name) <= step:
+            return len('[ ] ') + len(name.strip())
+        return len('[ ] ') + max(len(name[start:start + step].strip()) for start in range(0, len(name), step))
 
     @property
     def title(self):
         return ' ' * len('[x] ') + self.tasks.name.title()
 
+    def measure(self, tasks: Iterable[Task]) -> int:
+        return max(len(self.title), max(map(self.task_width, tasks), default=0))
+
     @property
     def width(self):
-        if self._width is not None:
-            return self._width
-        self._width = len(self.title)
-        for task in self.tasks.all():
-            task_string = self.present_task(task)
-            self._width = max(self._width, max(map(lambda s: len(s), task_string.split('\n'))))
+        if self._width is None:
+            self._width = self.measure(self.tasks.all())
         return self._width
 
     @property
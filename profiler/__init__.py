@@ -0,0 +1,2 @@
+from .profiler import DUMP, EXPORT, IMPORT, LOOKUP, MUTATE, PARSE, READ, RENDER, WRITE
+from .profiler import Profiler, active, stage, start, stop
@@ -0,0 +1,93 @@
+import json
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, List, Optional, TextIO
+
+IMPORT = 'import'
+READ = 'storage read'
+PARSE = 'parse'
+LOOKUP = 'lookup'
+MUTATE = 'mutate'
+DUMP = 'dump'
+WRITE = 'write'
+RENDER = 'render'
+EXPORT = 'export'
+
+
+class Profiler:
+    def __init__(self, cprofile_path: Optional[str] = None):
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.total = 0.0
+        self.cprofile_path = cprofile_path
+        self._stack: List[List[float]] = []
+        self._cprofile = None
+        if cprofile_path:
+            import cProfile
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str):
+        children = [0.0, 0]
+        self._stack.append(children)
+        blocks = sys.getallocatedblocks()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - started
+            allocated = sys.getallocatedblocks() - blocks
+            self._stack.pop()
+            if self._stack:
+                self._stack[-1][0] += seconds
+                self._stack[-1][1] += allocated
+            record = self.stages.setdefault(name, {'calls': 0, 'seconds': 0.0, 'allocated_blocks': 0})
+            record['calls'] += 1
+            record['seconds'] += seconds - children[0]
+            record['allocated_blocks'] += allocated - children[1]
+
+    def stop(self):
+        self.total = time.perf_counter() - self._started
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self._cprofile.dump_stats(self.cprofile_path)
+            self._cprofile = None
+
+    def report(self, stream: TextIO):
+        for name, record in self.stages.items():
+            stream.write(
+                f"{name:<13}{record['calls']:>6} calls {record['seconds'] * 1000:>10.2f}ms"
+                f" {record['allocated_blocks']:>10} blocks\n"
+            )
+        stream.write(f"{'total':<13}{'':>12} {self.total * 1000:>10.2f}ms\n")
+
+    def dump_trace(self, path: str):
+        with open(path, 'w') as file:
+            json.dump({'total_seconds': self.total, 'stages': self.stages}, file, indent=4)
+
+
+_profiler: Optional[Profiler] = None
+
+
+def start(cprofile_path: Optional[str] = None) -> Profiler:
+    global _profiler
+    _profiler = Profiler(cprofile_path)
+    return _profiler
+
+
+def stop() -> Optional[Profiler]:
+    global _profiler
+    profiler, _profiler = _profiler, None
+    if profiler is not None:
+        profiler.stop()
+    return profiler
+
+
+def active() -> Optional[Profiler]:
+    return _profiler
+
+
+def stage(name: str):
+    return nullcontext() if _profiler is None else _profiler.stage(name)
@@ -30,6 +30,6 @@ setup(
     ],
     entry_points='''
         [console_scripts]
-        task=cli_client.client:task
+        task=cli_client.daemon:main
     ''',
 )
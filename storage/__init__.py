@@ -1 +1,4 @@
-from .factory import SimpleJsonStorageFactory
+from .factory import (
+    SimpleJsonStorageFactory, CompactJsonStorageFactory, SqliteStorageFactory, JournalStorageFactory,
+    BinaryStorageFactory
+)
@@ -1,5 +1,7 @@
 import string
 from abc import ABC, abstractmethod
+from contextlib import nullcontext
+from typing import ContextManager
 
 from tasks import Tasks
 
@@ -18,6 +20,9 @@ class IO(ABC):
     def extension(self):
         pass
 
+    def lock(self, path: str) -> ContextManager:
+        return nullcontext()
+
     def get_file_name(self, name: str):
         valid_characters = string.ascii_letters + string.digits
         file_name = ''.join(
@@ -40,9 +45,15 @@ class Parser(ABC):
     def dump(self, tasks: Tasks):
         pass
 
+    def load_snapshot(self, content) -> Tasks:
+        raise NotImplementedError
+
+    def dump_snapshot(self, tasks: Tasks):
+        raise NotImplementedError
+
 
 class StorageFactory(ABC):
     @staticmethod
     @abstractmethod
-    def create(storage_path: str):
+    def create(storage_path: str, parse_cache: bool = False, compact_tasks: bool = False):
         pass
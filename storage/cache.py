@@ -0,0 +1,72 @@
+import os
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from tasks import Tasks
+
+Signature = Tuple[Optional[Tuple[int, int, int]], ...]
+
+
+def signature(*paths: str) -> Signature:
+    stats = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            stats.append(None)
+        else:
+            stats.append((stat.st_mtime_ns, stat.st_size, stat.st_ino))
+    return tuple(stats)
+
+
+class GroupCache:
+    MAX_ENTRIES = 128
+    MAX_BYTES = 64 * 1024 * 1024
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, max_bytes: int = MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.size = 0
+        self._entries: 'OrderedDict[str, Tuple[Signature, Tasks, int]]' = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: str, current: Signature) -> Optional[Tasks]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != current:
+            self.misses += 1
+            if entry is not None:
+                self.invalidate(key)
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def store(self, key: str, current: Signature, tasks: Tasks):
+        self.invalidate(key)
+        weight = sum(stat[1] for stat in current if stat is not None)
+        if weight > self.max_bytes:
+            return
+        self._entries[key] = (current, tasks, weight)
+        self.size += weight
+        while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+            _, (_, _, evicted) = self._entries.popitem(last=False)
+            self.size -= evicted
+
+    def invalidate(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry[2]
+
+    def clear(self):
+        self._entries.clear()
+        self.size = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries), 'bytes': self.size}
+
+
+shared_cache = GroupCache()
@@ -1,10 +1,48 @@
+from tasks import CompactTasks, SimpleTasks
 from .abstract import StorageFactory
-from .io import JsonIO
-from .parser import SimpleJsonParser
-from .storage import Storage
+from .io import BinaryIO, JsonIO, JsonLinesIO, MarshalIO, SqliteIO
+from .parser import BinaryParser, SimpleJsonParser, SqliteParser
+from .storage import Storage, BinaryStorage, JournalStorage, SqliteStorage
+
+
+def _cache_io(parse_cache: bool):
+    return MarshalIO() if parse_cache else None
+
+
+def _tasks_class(compact_tasks: bool):
+    return CompactTasks if compact_tasks else SimpleTasks
 
 
 class SimpleJsonStorageFactory(StorageFactory):
     @staticmethod
-    def create(storage_path: str):
-        return Storage(SimpleJsonParser(), JsonIO(), storage_path)
+    def create(storage_path: str, parse_cache: bool = False, compact_tasks: bool = False):
+        parser = SimpleJsonParser(tasks_class=_tasks_class(compact_tasks))
+        return Storage(parser, JsonIO(), storage_path, _cache_io(parse_cache))
+
+
+class CompactJsonStorageFactory(StorageFactory):
+    @staticmethod
+    def create(storage_path: str, parse_cache: bool = False, compact_tasks: bool = False):
+        parser = SimpleJsonParser(compact=True, tasks_class=_tasks_class(compact_tasks))
+        return Storage(parser, JsonIO(compact=True), storage_path, _cache_io(parse_cache))
+
+
+class SqliteStorageFactory(StorageFactory):
+    @staticmethod
+    def create(storage_path: str, parse_cache: bool = False, compact_tasks: bool = False):
+        return SqliteStorage(SqliteParser(_tasks_class(compact_tasks)), SqliteIO(), storage_path, _cache_io(parse_cache))
+
+
+class JournalStorageFactory(StorageFactory):
+    @staticmethod
+    def create(storage_path: str, parse_cache: bool = False, compact_tasks: bool = False):
+        parser = SimpleJsonParser(compact=True, tasks_class=_tasks_class(compact_tasks))
+        return JournalStorage(
+            parser, JsonIO(compact=True), storage_path, JsonLinesIO(), cache_io=_cache_io(parse_cache)
+        )
+
+
+class BinaryStorageFactory(StorageFactory):
+    @staticmethod
+    def create(storage_path: str, parse_cache: bool = False, compact_tasks: bool = False):
+        return BinaryStorage(BinaryParser(_tasks_class(compact_tasks)), BinaryIO(), storage_path, _cache_io(parse_cache))
@@ -1,20 +1,302 @@
 import json
-from typing import Dict
+import marshal
+import mmap
+import os
+import shutil
+import sqlite3
+import struct
+import sys
+import tempfile
+import threading
+from contextlib import closing, contextmanager
+from typing import Dict, Iterator, List, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
 
 from .abstract import IO
 
 
+@contextmanager
+def atomic_open(path: str, mode: str = 'w'):
+    directory = os.path.dirname(path) or '.'
+    descriptor, temporary_path = tempfile.mkstemp(dir=directory, prefix='.', suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, mode) as file:
+            yield file
+            file.flush()
+            os.fsync(file.fileno())
+        if os.path.exists(path):
+            shutil.copymode(path, temporary_path)
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.remove(temporary_path)
+        raise
+    if hasattr(os, 'O_DIRECTORY'):
+        directory_descriptor = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(directory_descriptor)
+        finally:
+            os.close(directory_descriptor)
+
+
+class HeldLock:
+    def __init__(self):
+        self.thread_lock = threading.RLock()
+        self.depth = 0
+        self.file = None
+
+
+held_locks: Dict[str, HeldLock] = {}
+held_locks_guard = threading.Lock()
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=held_locks.clear)
+
+
+@contextmanager
+def file_lock(path: str):
+    if fcntl is None:  # pragma: no cover
+        yield
+        return
+    lock_path = os.path.abspath(path + '.lock')
+    with held_locks_guard:
+        held = held_locks.setdefault(lock_path, HeldLock())
+    with held.thread_lock:
+        if not held.depth:
+            held.file = open(lock_path, 'a')
+            try:
+                fcntl.flock(held.file.fileno(), fcntl.LOCK_EX)
+            except BaseException:
+                held.file.close()
+                raise
+        held.depth += 1
+        try:
+            yield
+        finally:
+            held.depth -= 1
+            if not held.depth:
+                fcntl.flock(held.file.fileno(), fcntl.LOCK_UN)
+                held.file.close()
+                held.file = None
+
+
 class JsonIO(IO):
+    def __init__(self, compact: bool = False):
+        self.compact = compact
+
     def load_from(self, path: str) -> Dict:
-        file = open(path)
-        content = file.read()
-        file.close()
-        return json.loads(content)
+        with open(path, 'rb') as file:
+            return json.loads(file.read())
 
     def save_to(self, content: Dict, path: str):
-        with open(path, 'w') as file:
-            json.dump(content, file, indent=4, sort_keys=True)
+        with atomic_open(path) as file:
+            if self.compact:
+                json.dump(content, file, separators=(',', ':'))
+            else:
+                json.dump(content, file, indent=4, sort_keys=True)
+
+    def lock(self, path: str):
+        return file_lock(path)
 
     @property
     def extension(self):
         return '.json'
+
+
+class JsonLinesIO(IO):
+    def load_from(self, path: str) -> List[Dict]:
+        with open(path) as file:
+            lines = file.read().splitlines()
+        entries = []
+        for number, line in enumerate(lines, start=1):
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                if number < len(lines):
+                    raise
+        return entries
+
+    def save_to(self, content: List[Dict], path: str):
+        with atomic_open(path) as file:
+            file.writelines(json.dumps(entry) + '\n' for entry in content)
+
+    def append_to(self, entry: Dict, path: str):
+        with open(path, 'a') as file:
+            file.write(json.dumps(entry) + '\n')
+
+    @property
+    def extension(self):
+        return '.log'
+
+
+class SqliteIO(IO):
+    SCHEMA = (
+        'CREATE TABLE IF NOT EXISTS groups (name TEXT NOT NULL)',
+        'CREATE TABLE IF NOT EXISTS tasks ('
+        '"group" TEXT NOT NULL, name TEXT NOT NULL, done INTEGER NOT NULL, position INTEGER NOT NULL)',
+        'CREATE UNIQUE INDEX IF NOT EXISTS tasks_group_name ON tasks ("group", name)',
+        'CREATE INDEX IF NOT EXISTS tasks_group_position ON tasks ("group", position)',
+    )
+
+    def load_from(self, path: str) -> Tuple[str, List[Tuple[str, bool]]]:
+        if not os.path.isfile(path):
+            raise FileNotFoundError(path)
+        with closing(self._connect(path)) as connection:
+            group, = connection.execute('SELECT name FROM groups').fetchone()
+            rows = connection.execute(
+                'SELECT name, done FROM tasks WHERE "group" = ? ORDER BY position', (group,)
+            ).fetchall()
+        return group, [(name, bool(done)) for name, done in rows]
+
+    def save_to(self, content: Tuple[str, List[Tuple[str, bool]]], path: str):
+        group, rows = content
+        with closing(self._connect(path)) as connection, connection:
+            connection.execute('BEGIN IMMEDIATE')
+            connection.execute('DELETE FROM groups')
+            connection.execute('INSERT INTO groups (name) VALUES (?)', (group,))
+            connection.execute('DELETE FROM tasks WHERE "group" = ?', (group,))
+            connection.executemany(
+                'INSERT INTO tasks ("group", name, done, position) VALUES (?, ?, ?, ?)',
+                ((group, name, done, position) for position, (name, done) in enumerate(rows))
+            )
+
+    def save_row(self, group: str, name: str, done: bool, path: str):
+        with closing(self._connect(path)) as connection, connection:
+            connection.execute(
+                'INSERT INTO tasks ("group", name, done, position) '
+                'SELECT ?, ?, ?, COALESCE(MAX(position), -1) + 1 FROM tasks WHERE "group" = ? '
+                'ON CONFLICT ("group", name) DO UPDATE SET done = excluded.done',
+                (group, name, done, group)
+            )
+
+    def rename_row(self, group: str, name: str, new_name: str, path: str):
+        with closing(self._connect(path)) as connection, connection:
+            connection.execute('UPDATE tasks SET name = ? WHERE "group" = ? AND name = ?', (new_name, group, name))
+
+    def delete_row(self, group: str, name: str, path: str):
+        with closing(self._connect(path)) as connection, connection:
+            connection.execute('DELETE FROM tasks WHERE "group" = ? AND name = ?', (group, name))
+
+    def _connect(self, path: str) -> sqlite3.Connection:
+        connection = sqlite3.connect(path)
+        for statement in self.SCHEMA:
+            connection.execute(statement)
+        connection.commit()
+        return connection
+
+    def lock(self, path: str):
+        return file_lock(path)
+
+    @property
+    def extension(self):
+        return '.sqlite3'
+
+
+class BinaryGroup:
+    MAGIC = b'TASK'
+    VERSION = 1
+    HEADER = struct.Struct('<4sHII')
+    OFFSET = struct.Struct('<I')
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        magic, version, self.count, name_length = self.HEADER.unpack_from(buffer, 0)
+        if magic != self.MAGIC or version != self.VERSION:
+            raise ValueError('Not a binary tasks group!')
+        self.name = bytes(buffer[self.HEADER.size:self.HEADER.size + name_length]).decode()
+        self.bitset_offset = self.HEADER.size + name_length
+        self.offsets_offset = self.bitset_offset + (self.count + 7) // 8
+        self.blob_offset = self.offsets_offset + (self.count + 1) * self.OFFSET.size
+
+    @classmethod
+    def pack(cls, group: str, rows: List[Tuple[str, bool]]) -> bytes:
+        name = group.encode()
+        names = [task_name.encode() for task_name, _ in rows]
+        bitset = bytearray((len(rows) + 7) // 8)
+        for position, (_, done) in enumerate(rows):
+            if done:
+                bitset[position >> 3] |= 1 << (position & 7)
+        offsets = [0]
+        for task_name in names:
+            offsets.append(offsets[-1] + len(task_name))
+        return b''.join([
+            cls.HEADER.pack(cls.MAGIC, cls.VERSION, len(rows), len(name)),
+            name,
+            bytes(bitset),
+            struct.pack(f'<{len(offsets)}I', *offsets),
+            *names,
+        ])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+
+    def done(self, position: int) -> bool:
+        return bool(self.buffer[self.bitset_offset + (position >> 3)] & (1 << (position & 7)))
+
+    def set_done(self, position: int, done: bool):
+        index = self.bitset_offset + (position >> 3)
+        if done:
+            self.buffer[index] |= 1 << (position & 7)
+        else:
+            self.buffer[index] &= ~(1 << (position & 7)) & 0xFF
+
+    def task_name(self, position: int) -> str:
+        start, = self.OFFSET.unpack_from(self.buffer, self.offsets_offset + position * self.OFFSET.size)
+        end, = self.OFFSET.unpack_from(self.buffer, self.offsets_offset + (position + 1) * self.OFFSET.size)
+        return bytes(self.buffer[self.blob_offset + start:self.blob_offset + end]).decode()
+
+    def __iter__(self) -> Iterator[Tuple[str, bool]]:
+        for position in range(self.count):
+            yield self.task_name(position), self.done(position)
+
+
+class BinaryIO(IO):
+    def load_from(self, path: str) -> BinaryGroup:
+        with open(path, 'rb') as file:
+            return BinaryGroup(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def save_to(self, content: Tuple[str, List[Tuple[str, bool]]], path: str):
+        with atomic_open(path, 'wb') as file:
+            file.write(BinaryGroup.pack(*content))
+
+    def save_done(self, position: int, name: str, done: bool, path: str) -> bool:
+        with open(path, 'r+b') as file, mmap.mmap(file.fileno(), 0) as buffer:
+            group = BinaryGroup(buffer)
+            if position >= group.count or group.task_name(position) != name:
+                return False
+            group.set_done(position, done)
+            buffer.flush()
+        os.utime(path)
+        return True
+
+    def lock(self, path: str):
+        return file_lock(path)
+
+    @property
+    def extension(self):
+        return '.tasks'
+
+
+class MarshalIO(IO):
+    VERSION = (1,) + tuple(sys.version_info[:2])
+
+    def load_from(self, path: str):
+        with open(path, 'rb') as file:
+            version, content = marshal.loads(file.read())
+        if version != self.VERSION:
+            raise ValueError('Parse cache was written by another version!')
+        return content
+
+    def save_to(self, content, path: str):
+        with atomic_open(path, 'wb') as file:
+            file.write(marshal.dumps((self.VERSION, content)))
+
+    @property
+    def extension(self):
+        return '.cache'
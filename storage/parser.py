@@ -1,22 +1,47 @@
+from abc import ABC
+from typing import List, Tuple, Type
+
 from tasks import Tasks, SimpleTasks
 
 from .abstract import Parser
+from .io import BinaryGroup
+
+
+class SimpleTasksParser(Parser, ABC):
+    def __init__(self, tasks_class: Type[Tasks] = SimpleTasks):
+        self.tasks_class = tasks_class
+
+    def load_empty(self, name) -> Tasks:
+        return self.tasks_class(name)
 
+    def load_snapshot(self, content: Tuple[str, List[str], bytes]) -> Tasks:
+        return self.tasks_class.from_snapshot(*content)
 
-class SimpleJsonParser(Parser):
-    def load_empty(self, name) -> SimpleTasks:
-        return SimpleTasks(name)
+    def dump_snapshot(self, tasks: Tasks) -> Tuple[str, List[str], bytes]:
+        return (tasks.name, *tasks.snapshot())
 
-    def load(self, content: dict) -> SimpleTasks:
+
+class SimpleJsonParser(SimpleTasksParser):
+    def __init__(self, compact: bool = False, tasks_class: Type[Tasks] = SimpleTasks):
+        super().__init__(tasks_class)
+        self.compact = compact
+
+    def load(self, content: dict) -> Tasks:
         tasks_name = content['group']
         tasks = self.load_empty(tasks_name)
-        for task_item in content['tasks']:
-            task = tasks.add(task_item['name'])
-            if task_item["done"]:
-                task.finish()
+        task_items = content['tasks']
+        if task_items and isinstance(task_items[0], list):
+            tasks.extend(task_items)
+        else:
+            tasks.extend((task_item['name'], task_item['done']) for task_item in task_items)
         return tasks
 
     def dump(self, tasks: Tasks) -> dict:
+        if self.compact:
+            return {
+                "group": tasks.name,
+                "tasks": [[task.name, task.done] for task in tasks.ordered()]
+            }
         content = {
             "group": tasks.name,
             "tasks": [
@@ -24,7 +49,24 @@ class SimpleJsonParser(Parser):
                     "name": task.name,
                     "done": task.done
                 }
-                for task in tasks.all()
+                for task in tasks.ordered()
             ]
         }
         return content
+
+
+class SqliteParser(SimpleTasksParser):
+    def load(self, content: Tuple[str, List[Tuple[str, bool]]]) -> Tasks:
+        tasks_name, rows = content
+        tasks = self.load_empty(tasks_name)
+        tasks.extend(rows)
+        return tasks
+
+    def dump(self, tasks: Tasks) -> Tuple[str, List[Tuple[str, bool]]]:
+        return tasks.name, [(task.name, task.done) for task in tasks.ordered()]
+
+
+class BinaryParser(SqliteParser):
+    def load(self, content: BinaryGroup) -> Tasks:
+        with content:
+            return super().load((content.name, content))
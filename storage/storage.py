@@ -1,14 +1,19 @@
 import os
+from typing import Dict, List, Optional, Tuple
 
+import profiler
 from tasks import Tasks
 from .abstract import IO, Parser
+from .cache import GroupCache, Signature, shared_cache, signature
+from .io import BinaryIO, JsonLinesIO, MarshalIO, SqliteIO
 
 
 class Storage:
-    def __init__(self, parser: Parser, io: IO, storage_path: str):
+    def __init__(self, parser: Parser, io: IO, storage_path: str, cache_io: Optional[MarshalIO] = None):
         self.parser = parser
         self.io = io
         self.storage_path = storage_path
+        self.cache_io = cache_io
         self.create_path()
 
     def create_path(self):
@@ -18,16 +23,307 @@ class Storage:
     def path(self, tasks_name: str):
         return os.path.join(self.storage_path, tasks_name + self.io.extension)
 
+    def names(self) -> List[str]:
+        extension = self.io.extension
+        return sorted(
+            file_name[:-len(extension)] for file_name in os.listdir(self.storage_path)
+            if file_name.endswith(extension) and not file_name.startswith('.')
+        )
+
+    def file_path(self, tasks_name: str):
+        return os.path.join(self.storage_path, self.io.get_file_name(tasks_name))
+
+    def lock(self, tasks_name: str):
+        return self.io.lock(self.file_path(tasks_name))
+
+    def signature(self, tasks_name: str) -> Signature:
+        return signature(self.file_path(tasks_name))
+
+    def invalidate(self, tasks_name: str):
+        pass
+
     def put(self, tasks: Tasks):
-        path = os.path.join(self.storage_path, self.io.get_file_name(tasks.name))
-        content = self.parser.dump(tasks)
-        self.io.save_to(content, path)
+        with profiler.stage(profiler.DUMP):
+            content = self.parser.dump(tasks)
+        with profiler.stage(profiler.WRITE):
+            self.io.save_to(content, self.file_path(tasks.name))
+
+    def put_task(self, tasks: Tasks, task_name: str):
+        self.put(tasks)
+
+    def rename_task(self, tasks: Tasks, task_name: str, new_name: str):
+        self.put(tasks)
+
+    def delete_task(self, tasks: Tasks, task_name: str):
+        self.put(tasks)
 
     def get(self, tasks_name: str):
-        path = os.path.join(self.storage_path, self.io.get_file_name(tasks_name))
+        path = self.file_path(tasks_name)
+        current = None
+        if self.cache_io is not None:
+            current = signature(path)
+            tasks = self._load_parse_cache(path, current)
+            if tasks is not None:
+                return tasks
         try:
-            content = self.io.load_from(path)
+            with profiler.stage(profiler.READ):
+                content = self.io.load_from(path)
         except FileNotFoundError:
-            self.put(self.parser.load_empty(tasks_name))
+            with self.lock(tasks_name):
+                if not os.path.exists(path):
+                    self.put(self.parser.load_empty(tasks_name))
             return self.get(tasks_name)
-        return self.parser.load(content)
+        with profiler.stage(profiler.PARSE):
+            tasks = self.parser.load(content)
+        if self.cache_io is not None:
+            self._save_parse_cache(path, current, tasks)
+        return tasks
+
+    def parse_cache_path(self, path: str):
+        return path + self.cache_io.extension
+
+    def _load_parse_cache(self, path: str, current: Signature):
+        if current[0] is None:
+            return None
+        try:
+            with profiler.stage(profiler.READ):
+                source, content = self.cache_io.load_from(self.parse_cache_path(path))
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        if source != current:
+            return None
+        with profiler.stage(profiler.PARSE):
+            return self.parser.load_snapshot(content)
+
+    def _save_parse_cache(self, path: str, current: Signature, tasks: Tasks):
+        if current[0] is None or signature(path) != current:
+            return
+        try:
+            with profiler.stage(profiler.WRITE):
+                self.cache_io.save_to((current, self.parser.dump_snapshot(tasks)), self.parse_cache_path(path))
+        except OSError:
+            pass
+
+
+class SqliteStorage(Storage):
+    io: SqliteIO
+
+    def put_task(self, tasks: Tasks, task_name: str):
+        task = tasks[task_name]
+        self.io.save_row(tasks.name, task.name, task.done, self.file_path(tasks.name))
+
+    def rename_task(self, tasks: Tasks, task_name: str, new_name: str):
+        self.io.rename_row(tasks.name, task_name, new_name, self.file_path(tasks.name))
+
+    def delete_task(self, tasks: Tasks, task_name: str):
+        self.io.delete_row(tasks.name, task_name, self.file_path(tasks.name))
+
+
+class JournalStorage(Storage):
+    COMPACTION_THRESHOLD = 64 * 1024
+
+    def __init__(self, parser: Parser, io: IO, storage_path: str, journal_io: JsonLinesIO,
+                 compaction_threshold: int = COMPACTION_THRESHOLD, cache_io: Optional[MarshalIO] = None):
+        super().__init__(parser, io, storage_path, cache_io)
+        self.journal_io = journal_io
+        self.compaction_threshold = compaction_threshold
+
+    def journal_path(self, tasks_name: str):
+        return os.path.join(self.storage_path, self.journal_io.get_file_name(tasks_name))
+
+    def signature(self, tasks_name: str) -> Signature:
+        return signature(self.file_path(tasks_name), self.journal_path(tasks_name))
+
+    def put(self, tasks: Tasks):
+        super().put(tasks)
+        try:
+            os.remove(self.journal_path(tasks.name))
+        except FileNotFoundError:
+            pass
+
+    def put_task(self, tasks: Tasks, task_name: str):
+        self._append(tasks, {'op': 'put', 'name': task_name, 'done': tasks[task_name].done})
+
+    def rename_task(self, tasks: Tasks, task_name: str, new_name: str):
+        self._append(tasks, {'op': 'rename', 'name': task_name, 'new_name': new_name})
+
+    def delete_task(self, tasks: Tasks, task_name: str):
+        self._append(tasks, {'op': 'delete', 'name': task_name})
+
+    def get(self, tasks_name: str):
+        tasks = super().get(tasks_name)
+        try:
+            with profiler.stage(profiler.READ):
+                entries = self.journal_io.load_from(self.journal_path(tasks_name))
+        except FileNotFoundError:
+            return tasks
+        with profiler.stage(profiler.PARSE):
+            for entry in entries:
+                self._replay(tasks, entry)
+        return tasks
+
+    def _append(self, tasks: Tasks, entry: dict):
+        path = self.journal_path(tasks.name)
+        self.journal_io.append_to(entry, path)
+        if os.path.getsize(path) > self.compaction_threshold:
+            self.put(tasks)
+
+    @staticmethod
+    def _replay(tasks: Tasks, entry: dict):
+        name = entry['name']
+        if entry['op'] == 'put':
+            task = tasks[name] if tasks.has(name) else tasks.add(name)
+            if entry['done']:
+                task.finish()
+            else:
+                task.undo()
+        elif entry['op'] == 'rename' and tasks.has(name):
+            tasks[name] = entry['new_name']
+        elif entry['op'] == 'delete' and tasks.has(name):
+            tasks.delete(name)
+
+
+class BinaryStorage(Storage):
+    io: BinaryIO
+
+    def put_task(self, tasks: Tasks, task_name: str):
+        task = tasks[task_name]
+        if not self.io.save_done(tasks.position(task.name), task.name, task.done, self.file_path(tasks.name)):
+            self.put(tasks)
+
+
+class WriteBehindStorage(Storage):
+    def __init__(self, storage: Storage):
+        super().__init__(storage.parser, storage.io, storage.storage_path)
+        self.storage = storage
+        self._tasks: Dict[str, Tasks] = {}
+        self._dirty: Dict[str, Tasks] = {}
+        self._loaded: Dict[str, Tuple[Signature, List[Tuple[str, bool]]]] = {}
+
+    @property
+    def pending(self) -> int:
+        return len(self._dirty)
+
+    def lock(self, tasks_name: str):
+        return self.storage.lock(tasks_name)
+
+    def signature(self, tasks_name: str) -> Signature:
+        return self.storage.signature(tasks_name)
+
+    def get(self, tasks_name: str):
+        path = self.file_path(tasks_name)
+        if path in self._tasks and self.signature(tasks_name) != self._loaded[path][0]:
+            if path in self._dirty:
+                self._flush(path)
+            else:
+                self._forget(path)
+        if path not in self._tasks:
+            with self.storage.lock(tasks_name):
+                tasks = self.storage.get(tasks_name)
+                self._remember(path, tasks)
+            self._tasks[path] = tasks
+        return self._tasks[path]
+
+    def put(self, tasks: Tasks):
+        path = self.file_path(tasks.name)
+        self._tasks[path] = self._dirty[path] = tasks
+
+    def put_task(self, tasks: Tasks, task_name: str):
+        self.put(tasks)
+
+    def rename_task(self, tasks: Tasks, task_name: str, new_name: str):
+        self.put(tasks)
+
+    def delete_task(self, tasks: Tasks, task_name: str):
+        self.put(tasks)
+
+    def flush(self):
+        while self._dirty:
+            self._flush(next(iter(self._dirty)))
+
+    def invalidate(self, tasks_name: str):
+        path = self.file_path(tasks_name)
+        if path not in self._dirty:
+            self._forget(path)
+        self.storage.invalidate(tasks_name)
+
+    def release(self):
+        self.flush()
+        self._tasks.clear()
+        self._loaded.clear()
+
+    def _flush(self, path: str):
+        tasks = self._dirty[path]
+        with self.storage.lock(tasks.name):
+            loaded, baseline = self._loaded.get(path, (None, None))
+            if baseline is not None and self.signature(tasks.name) != loaded:
+                tasks = self._merge(self.storage.get(tasks.name), baseline, tasks)
+            self.storage.put(tasks)
+            self._remember(path, tasks)
+        self._tasks[path] = tasks
+        del self._dirty[path]
+
+    def _remember(self, path: str, tasks: Tasks):
+        self._loaded[path] = (self.signature(tasks.name), [(task.name, task.done) for task in tasks.ordered()])
+
+    def _forget(self, path: str):
+        self._tasks.pop(path, None)
+        self._loaded.pop(path, None)
+
+    @staticmethod
+    def _merge(current: Tasks, baseline: List[Tuple[str, bool]], tasks: Tasks) -> Tasks:
+        before = dict(baseline)
+        after = {task.name: task.done for task in tasks.ordered()}
+        for name in before.keys() - after.keys():
+            if current.has(name):
+                current.delete(name)
+        for name, done in after.items():
+            if before.get(name) != done:
+                task = current[name] if current.has(name) else current.add(name)
+                task.done = done
+        return current
+
+
+class CachedStorage(Storage):
+    def __init__(self, storage: Storage, cache: GroupCache = shared_cache):
+        super().__init__(storage.parser, storage.io, storage.storage_path)
+        self.storage = storage
+        self.cache = cache
+
+    def lock(self, tasks_name: str):
+        return self.storage.lock(tasks_name)
+
+    def signature(self, tasks_name: str) -> Signature:
+        return self.storage.signature(tasks_name)
+
+    def invalidate(self, tasks_name: str):
+        self.cache.invalidate(self.file_path(tasks_name))
+
+    def get(self, tasks_name: str):
+        path = self.file_path(tasks_name)
+        before = self.signature(tasks_name)
+        tasks = self.cache.get(path, before)
+        if tasks is None:
+            tasks = self.storage.get(tasks_name)
+            after = self.signature(tasks_name)
+            if before == after:
+                self.cache.store(path, after, tasks)
+        return tasks
+
+    def put(self, tasks: Tasks):
+        self._write(self.storage.put, tasks)
+
+    def put_task(self, tasks: Tasks, task_name: str):
+        self._write(self.storage.put_task, tasks, task_name)
+
+    def rename_task(self, tasks: Tasks, task_name: str, new_name: str):
+        self._write(self.storage.rename_task, tasks, task_name, new_name)
+
+    def delete_task(self, tasks: Tasks, task_name: str):
+        self._write(self.storage.delete_task, tasks, task_name)
+
+    def _write(self, write, tasks: Tasks, *args):
+        path = self.file_path(tasks.name)
+        self.cache.invalidate(path)
+        write(tasks, *args)
+        self.cache.store(path, self.signature(tasks.name), tasks)
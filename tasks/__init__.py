@@ -1,2 +1,2 @@
 from .abstract import Task, Tasks
-from .tasks import SimpleTasks
+from .tasks import CompactTasks, SimpleTasks
@@ -1,8 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 
 class Task(ABC):
+    __slots__ = ()
+
     def __init__(self, name: str):
         self.name = name
         self.done = False
@@ -18,13 +20,55 @@ class Task(ABC):
 
 
 class Tasks(ABC):
+    INSERTION_ORDER = 'insertion'
+    NAME_ORDER = 'name'
+    DONE_ORDER = 'done'
+    ORDERS = (INSERTION_ORDER, NAME_ORDER, DONE_ORDER)
+
     def __init__(self, name: str):
         self.name = name
 
+    @classmethod
+    def from_records(cls, name: str, records: Iterable[Tuple[str, bool]]) -> 'Tasks':
+        tasks = cls(name)
+        tasks.extend(records)
+        return tasks
+
+    @classmethod
+    @abstractmethod
+    def from_snapshot(cls, name: str, names: List[str], done: bytes) -> 'Tasks':
+        pass
+
+    @abstractmethod
+    def snapshot(self) -> Tuple[List[str], bytes]:
+        pass
+
     @abstractmethod
     def all(self) -> List[Task]:
         pass
 
+    @abstractmethod
+    def ordered(self, by: str = INSERTION_ORDER, desc: bool = False) -> List[Task]:
+        pass
+
+    @abstractmethod
+    def finished(self) -> Iterator[Task]:
+        pass
+
+    @abstractmethod
+    def unfinished(self) -> Iterator[Task]:
+        pass
+
+    @abstractmethod
+    def stats(self) -> Dict[str, int]:
+        pass
+
+    @abstractmethod
+    def window(self, offset: int = 0, limit: Optional[int] = None, only_unfinished: bool = False,
+               cursor: int = 0, by: str = INSERTION_ORDER,
+               desc: bool = False) -> Tuple[List[Task], Optional[int]]:
+        pass
+
     @property
     @abstractmethod
     def number_of_tasks(self) -> int:
@@ -34,6 +78,10 @@ class Tasks(ABC):
     def add(self, task_name: str) -> Task:
         pass
 
+    @abstractmethod
+    def extend(self, records: Iterable[Tuple[str, bool]]) -> List[Task]:
+        pass
+
     @abstractmethod
     def __getitem__(self, item: str):
         pass
@@ -50,6 +98,10 @@ class Tasks(ABC):
     def has(self, name: str) -> bool:
         pass
 
+    @abstractmethod
+    def position(self, name: str) -> int:
+        pass
+
     @abstractmethod
     def sort_by_name(self, desc=False) -> None:
         pass
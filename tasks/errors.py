@@ -1,5 +1,10 @@
+from typing import Iterable
+
+
 class UniqueViolationError(Exception):
-    pass
+    def __init__(self, message: str = '', names: Iterable[str] = ()):
+        super().__init__(message)
+        self.names = list(names)
 
 
 class ConflictError(Exception):
@@ -1,77 +1,429 @@
-from typing import List, Set
+from array import array
+from bisect import bisect_left, insort
+from collections import Counter
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 from .abstract import Task, Tasks
 from .errors import UniqueViolationError, ConflictError
 
 
+def _check_unique(tasks: Tasks, names: List[str]):
+    unique = set(names)
+    existing = {name for name in unique if tasks.has(name)}
+    if existing or len(unique) != len(names):
+        repeated = {name for name, count in Counter(names).items() if count > 1}
+        duplicates = sorted(existing | repeated)
+        raise UniqueViolationError(f'Tasks {", ".join(duplicates)} already exist in {tasks.name}', duplicates)
+
+
 class SimpleTasks(Tasks):
     class SimpleTask(Task):
-        pass
+        __slots__ = ('name', '_tasks', '_done', 'seq')
+
+        def __init__(self, name: str, tasks: 'SimpleTasks' = None, seq: int = 0):
+            self._tasks = tasks
+            self._done = False
+            self.seq = seq
+            super().__init__(name)
+
+        @property
+        def done(self):
+            return self._done
+
+        @done.setter
+        def done(self, done: bool):
+            if self._tasks is not None and done != self._done:
+                self._tasks._move(self, done)
+            self._done = done
 
     def __init__(self, name: str):
         super().__init__(name)
-        self._tasks: List[Task] = []
-        self._task_names: Set[str] = set()
+        self._tasks: Dict[int, Task] = {}
+        self._seqs: List[int] = []
+        self._finished: List[int] = []
+        self._unfinished: List[int] = []
+        self._next_seq = 0
+        self._task_names: Dict[str, Task] = {}
+        self._sorted_task_names: List[str] = []
+        self._order = (self.INSERTION_ORDER, False)
+
+    @classmethod
+    def from_snapshot(cls, name: str, names: List[str], done: bytes) -> 'SimpleTasks':
+        tasks = cls(name)
+        tasks._append(zip(names, done))
+        return tasks
+
+    def snapshot(self) -> Tuple[List[str], bytes]:
+        tasks = self._tasks.values()
+        return [task.name for task in tasks], bytes(task.done for task in tasks)
 
     def all(self) -> List[Task]:
-        return self._tasks
+        return self.ordered(*self._order)
+
+    def ordered(self, by: str = Tasks.INSERTION_ORDER, desc: bool = False) -> List[Task]:
+        if by == self.DONE_ORDER:
+            unfinished, finished = list(self.unfinished()), list(self.finished())
+            return finished + unfinished if desc else unfinished + finished
+        if by == self.NAME_ORDER:
+            tasks = [self._task_names[name] for name in self._sorted_task_names]
+        elif by == self.INSERTION_ORDER:
+            tasks = list(self._tasks.values())
+        else:
+            raise ValueError(f'Unknown order {by}!')
+        if desc:
+            tasks.reverse()
+        return tasks
+
+    def finished(self) -> Iterator[Task]:
+        return (self._tasks[seq] for seq in self._finished)
+
+    def unfinished(self) -> Iterator[Task]:
+        return (self._tasks[seq] for seq in self._unfinished)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'total': len(self._seqs),
+            'finished': len(self._finished),
+            'unfinished': len(self._unfinished),
+        }
+
+    def window(self, offset: int = 0, limit: Optional[int] = None, only_unfinished: bool = False,
+               cursor: int = 0, by: str = Tasks.INSERTION_ORDER,
+               desc: bool = False) -> Tuple[List[Task], Optional[int]]:
+        if by != self.INSERTION_ORDER or desc:
+            view = [task for task in self.ordered(by, desc) if not (only_unfinished and task.done)]
+            start = cursor + offset
+            stop = None if limit is None else start + limit
+            next_cursor = stop if stop is not None and stop < len(view) else None
+            return view[start:stop], next_cursor
+        seqs = self._unfinished if only_unfinished else self._seqs
+        start = bisect_left(seqs, cursor) + offset
+        stop = None if limit is None else start + limit
+        next_cursor = seqs[stop] if stop is not None and stop < len(seqs) else None
+        return [self._tasks[seq] for seq in seqs[start:stop]], next_cursor
 
     @property
     def number_of_tasks(self):
-        return len(self._tasks)
+        return len(self._seqs)
 
     def add(self, task_name: str):
         if task_name in self._task_names:
             raise UniqueViolationError(f'Task {task_name} already exists in {self.name}')
-        task = self.SimpleTask(task_name)
-        self._tasks.append(task)
-        self._task_names.add(task_name)
+        task = self.SimpleTask(task_name, self, self._next_seq)
+        self._next_seq += 1
+        self._tasks[task.seq] = task
+        self._seqs.append(task.seq)
+        self._unfinished.append(task.seq)
+        self._index(task)
         return task
 
+    def extend(self, records: Iterable[Tuple[str, bool]]) -> List[Task]:
+        records = list(records)
+        _check_unique(self, [name for name, _ in records])
+        return self._append(records)
+
+    def _append(self, records: Iterable[Tuple[str, bool]]) -> List[Task]:
+        added = []
+        seq = first_seq = self._next_seq
+        for name, done in records:
+            task = self.SimpleTask(name, self, seq)
+            task._done = bool(done)
+            self._tasks[seq] = self._task_names[name] = task
+            (self._finished if done else self._unfinished).append(seq)
+            added.append(task)
+            seq += 1
+        self._seqs.extend(range(first_seq, seq))
+        self._next_seq = seq
+        self._sorted_task_names = sorted(self._sorted_task_names + [task.name for task in added])
+        return added
+
     def delete(self, task_name: str):
-        index = self._find_task_index_based_on_full_match_or_prefix_match_on_name(task_name)
-        full_name = self._tasks[index].name
-        self._task_names.remove(full_name)
-        del self._tasks[index]
-
-    def _find_task_index_based_on_full_match_or_prefix_match_on_name(self, task_name):
-        matched_indices = []
-        for index, task in enumerate(self._tasks):
-            if task.name == task_name:
-                return index
-            elif task.name.startswith(task_name):
-                matched_indices.append(index)
-        if len(matched_indices) > 1:
-            raise ConflictError('More than one tasks matched!')
-        if len(matched_indices) == 1:
-            return matched_indices[0]
+        task = self._find_task_based_on_full_match_or_prefix_match_on_name(task_name)
+        self._unindex(task)
+        seqs = self._finished if task.done else self._unfinished
+        del seqs[bisect_left(seqs, task.seq)]
+        del self._seqs[bisect_left(self._seqs, task.seq)]
+        del self._tasks[task.seq]
+        task._tasks = None
+
+    def _move(self, task: Task, done: bool):
+        source, target = (self._unfinished, self._finished) if done else (self._finished, self._unfinished)
+        del source[bisect_left(source, task.seq)]
+        insort(target, task.seq)
+
+    def _index(self, task: Task):
+        self._task_names[task.name] = task
+        insort(self._sorted_task_names, task.name)
+
+    def _unindex(self, task: Task):
+        del self._task_names[task.name]
+        del self._sorted_task_names[bisect_left(self._sorted_task_names, task.name)]
+
+    def _find_task_based_on_full_match_or_prefix_match_on_name(self, task_name):
+        task = self._task_names.get(task_name)
+        if task is not None:
+            return task
+        names = self._sorted_task_names
+        index = bisect_left(names, task_name)
+        if index < len(names) and names[index].startswith(task_name):
+            if index + 1 < len(names) and names[index + 1].startswith(task_name):
+                raise ConflictError('More than one tasks matched!')
+            return self._task_names[names[index]]
         raise LookupError('Task not found!')
 
     def __getitem__(self, task_name: str):
-        index = self._find_task_index_based_on_full_match_or_prefix_match_on_name(task_name)
-        return self._tasks[index]
+        return self._find_task_based_on_full_match_or_prefix_match_on_name(task_name)
 
     def __setitem__(self, task_name, new_name: str):
-        index = self._find_task_index_based_on_full_match_or_prefix_match_on_name(task_name)
-        self._tasks[index].name = new_name
+        task = self._find_task_based_on_full_match_or_prefix_match_on_name(task_name)
+        if new_name == task.name:
+            return
+        if new_name in self._task_names:
+            raise UniqueViolationError(f'Task {new_name} already exists in {self.name}')
+        self._unindex(task)
+        task.name = new_name
+        self._index(task)
 
     def __eq__(self, other):
         other_tasks = other.all()
-        if len(other_tasks) != len(self._tasks):
+        if len(other_tasks) != len(self._seqs):
             return False
-        for index, other_task in enumerate(other_tasks):
-            if other_task != self._tasks[index]:
+        for other_task, task in zip(other_tasks, self.all()):
+            if other_task != task:
                 return False
         return True
 
     def has(self, name: str):
         return name in self._task_names
 
+    def position(self, name: str) -> int:
+        return bisect_left(self._seqs, self._task_names[name].seq)
+
     def sort_by_name(self, desc=False):
-        self._sort_by_field('name', desc)
+        self._order = (self.NAME_ORDER, desc)
 
     def sort_by_done_state(self, desc=False):
-        self._sort_by_field('done', desc)
+        self._order = (self.DONE_ORDER, desc)
+
+
+class CompactTasks(Tasks):
+    UNFINISHED, FINISHED, DELETED = 0, 1, 2
+
+    class CompactTask(Task):
+        __slots__ = ('_tasks', 'seq', '_generation')
+
+        def __init__(self, tasks: 'CompactTasks', seq: int):
+            self._tasks = tasks
+            self.seq = seq
+            self._generation = tasks._generation
+
+        @property
+        def _alive(self):
+            tasks = self._tasks
+            return tasks._generation == self._generation and tasks._states[self.seq] != CompactTasks.DELETED
+
+        @property
+        def name(self):
+            return self._tasks._names[self.seq] if self._alive else None
+
+        @name.setter
+        def name(self, name: str):
+            self._tasks[self.name] = name
+
+        @property
+        def done(self):
+            return self._alive and self._tasks._states[self.seq] == CompactTasks.FINISHED
+
+        @done.setter
+        def done(self, done: bool):
+            if self._alive:
+                self._tasks._states[self.seq] = CompactTasks.FINISHED if done else CompactTasks.UNFINISHED
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self._names: List[Optional[str]] = []
+        self._states = bytearray()
+        self._sorted_names: List[str] = []
+        self._sorted_seqs = array('L')
+        self._deleted = 0
+        self._generation = 0
+        self._order = (self.INSERTION_ORDER, False)
+
+    @classmethod
+    def from_snapshot(cls, name: str, names: List[str], done: bytes) -> 'CompactTasks':
+        tasks = cls(name)
+        tasks._names = list(names)
+        tasks._states = bytearray(done)
+        tasks._sorted_seqs = array('L', sorted(range(len(names)), key=tasks._names.__getitem__))
+        tasks._sorted_names = [tasks._names[seq] for seq in tasks._sorted_seqs]
+        return tasks
+
+    def snapshot(self) -> Tuple[List[str], bytes]:
+        if not self._deleted:
+            return list(self._names), bytes(self._states)
+        seqs = list(self._seqs())
+        return [self._names[seq] for seq in seqs], bytes(self._states[seq] for seq in seqs)
+
+    def _view(self, seq: int) -> Task:
+        return self.CompactTask(self, seq)
+
+    def _seqs(self, state: Optional[int] = None, start: int = 0) -> Iterator[int]:
+        states = self._states
+        if state is None:
+            return (seq for seq in range(start, len(states)) if states[seq] != self.DELETED)
+        return self._find(state, start)
+
+    def _find(self, state: int, start: int) -> Iterator[int]:
+        seq = self._states.find(state, start)
+        while seq != -1:
+            yield seq
+            seq = self._states.find(state, seq + 1)
 
-    def _sort_by_field(self, field: str, desc: bool):
-        self._tasks.sort(key=lambda task: getattr(task, field), reverse=desc)
+    def all(self) -> List[Task]:
+        return self.ordered(*self._order)
+
+    def ordered(self, by: str = Tasks.INSERTION_ORDER, desc: bool = False) -> List[Task]:
+        if by == self.DONE_ORDER:
+            unfinished, finished = list(self.unfinished()), list(self.finished())
+            return finished + unfinished if desc else unfinished + finished
+        if by == self.NAME_ORDER:
+            tasks = [self._view(seq) for seq in self._sorted_seqs]
+        elif by == self.INSERTION_ORDER:
+            tasks = [self._view(seq) for seq in self._seqs()]
+        else:
+            raise ValueError(f'Unknown order {by}!')
+        if desc:
+            tasks.reverse()
+        return tasks
+
+    def finished(self) -> Iterator[Task]:
+        return (self._view(seq) for seq in self._seqs(self.FINISHED))
+
+    def unfinished(self) -> Iterator[Task]:
+        return (self._view(seq) for seq in self._seqs(self.UNFINISHED))
+
+    def stats(self) -> Dict[str, int]:
+        finished = self._states.count(self.FINISHED)
+        return {
+            'total': self.number_of_tasks,
+            'finished': finished,
+            'unfinished': self.number_of_tasks - finished,
+        }
+
+    def window(self, offset: int = 0, limit: Optional[int] = None, only_unfinished: bool = False,
+               cursor: int = 0, by: str = Tasks.INSERTION_ORDER,
+               desc: bool = False) -> Tuple[List[Task], Optional[int]]:
+        if by != self.INSERTION_ORDER or desc:
+            view = [task for task in self.ordered(by, desc) if not (only_unfinished and task.done)]
+            start = cursor + offset
+            stop = None if limit is None else start + limit
+            next_cursor = stop if stop is not None and stop < len(view) else None
+            return view[start:stop], next_cursor
+        seqs = self._seqs(self.UNFINISHED if only_unfinished else None, cursor)
+        for _ in zip(range(offset), seqs):
+            pass
+        page = [self._view(seq) for seq in (seqs if limit is None else islice(seqs, limit))]
+        return page, next(seqs, None)
+
+    @property
+    def number_of_tasks(self):
+        return len(self._names) - self._deleted
+
+    def add(self, task_name: str):
+        index = bisect_left(self._sorted_names, task_name)
+        if index < len(self._sorted_names) and self._sorted_names[index] == task_name:
+            raise UniqueViolationError(f'Task {task_name} already exists in {self.name}')
+        seq = len(self._names)
+        self._names.append(task_name)
+        self._states.append(self.UNFINISHED)
+        self._sorted_names.insert(index, task_name)
+        self._sorted_seqs.insert(index, seq)
+        return self._view(seq)
+
+    def extend(self, records: Iterable[Tuple[str, bool]]) -> List[Task]:
+        records = list(records)
+        names = [name for name, _ in records]
+        _check_unique(self, names)
+        start = len(self._names)
+        self._names.extend(names)
+        self._states.extend(self.FINISHED if done else self.UNFINISHED for _, done in records)
+        entries = sorted([*zip(self._sorted_names, self._sorted_seqs), *zip(names, range(start, len(self._names)))])
+        self._sorted_names = [name for name, _ in entries]
+        self._sorted_seqs = array('L', (seq for _, seq in entries))
+        return [self._view(seq) for seq in range(start, len(self._names))]
+
+    def delete(self, task_name: str):
+        index = self._find_index_based_on_full_match_or_prefix_match_on_name(task_name)
+        seq = self._sorted_seqs[index]
+        del self._sorted_names[index]
+        del self._sorted_seqs[index]
+        self._names[seq] = None
+        self._states[seq] = self.DELETED
+        self._deleted += 1
+        if self._deleted * 2 > len(self._names):
+            self._compact()
+
+    def _compact(self):
+        seqs = list(self._seqs())
+        renumbered = {seq: new_seq for new_seq, seq in enumerate(seqs)}
+        self._names = [self._names[seq] for seq in seqs]
+        self._states = bytearray(self._states[seq] for seq in seqs)
+        self._sorted_seqs = array('L', (renumbered[seq] for seq in self._sorted_seqs))
+        self._deleted = 0
+        self._generation += 1
+
+    def _find_index_based_on_full_match_or_prefix_match_on_name(self, task_name):
+        names = self._sorted_names
+        index = bisect_left(names, task_name)
+        if index < len(names) and names[index] == task_name:
+            return index
+        if index < len(names) and names[index].startswith(task_name):
+            if index + 1 < len(names) and names[index + 1].startswith(task_name):
+                raise ConflictError('More than one tasks matched!')
+            return index
+        raise LookupError('Task not found!')
+
+    def __getitem__(self, task_name: str):
+        index = self._find_index_based_on_full_match_or_prefix_match_on_name(task_name)
+        return self._view(self._sorted_seqs[index])
+
+    def __setitem__(self, task_name, new_name: str):
+        index = self._find_index_based_on_full_match_or_prefix_match_on_name(task_name)
+        if new_name == self._sorted_names[index]:
+            return
+        if self.has(new_name):
+            raise UniqueViolationError(f'Task {new_name} already exists in {self.name}')
+        seq = self._sorted_seqs[index]
+        del self._sorted_names[index]
+        del self._sorted_seqs[index]
+        index = bisect_left(self._sorted_names, new_name)
+        self._sorted_names.insert(index, new_name)
+        self._sorted_seqs.insert(index, seq)
+        self._names[seq] = new_name
+
+    def __eq__(self, other):
+        other_tasks = other.all()
+        if len(other_tasks) != self.number_of_tasks:
+            return False
+        for other_task, task in zip(other_tasks, self.all()):
+            if other_task != task:
+                return False
+        return True
+
+    def has(self, name: str):
+        index = bisect_left(self._sorted_names, name)
+        return index < len(self._sorted_names) and self._sorted_names[index] == name
+
+    def position(self, name: str) -> int:
+        index = bisect_left(self._sorted_names, name)
+        if index == len(self._sorted_names) or self._sorted_names[index] != name:
+            raise KeyError(name)
+        seq = self._sorted_seqs[index]
+        return seq - self._states.count(self.DELETED, 0, seq) if self._deleted else seq
+
+    def sort_by_name(self, desc=False):
+        self._order = (self.NAME_ORDER, desc)
+
+    def sort_by_done_state(self, desc=False):
+        self._order = (self.DONE_ORDER, desc)
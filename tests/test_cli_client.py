@@ -1,12 +1,20 @@
+import os
+import re
+import subprocess
+import sys
+import tempfile
 from unittest import TestCase
 
+from click import ClickException
 from click.testing import CliRunner
 
-from cli_client import client
 from cli_client import config
-from cli_client.client import task, add, edit, finish, list_entries, export, undo, remove
+from cli_client.client import task, add, batch, edit, finish, list_entries, export, undo, remove, status
 from cli_client.factory import ClientManagerFactory
 from manager.abstract import TasksManager
+from presenter import presenter
+from storage import SimpleJsonStorageFactory
+from storage.storage import SqliteStorage, Storage
 from tasks.errors import UniqueViolationError, ConflictError
 
 storage = {}
@@ -62,6 +70,38 @@ class TestClientManagerFactory(TestCase):
     def test_client_manager_factory_returns_a_valid_manager(self):
         self.assertTrue(isinstance(ClientManagerFactory.create('foo'), TasksManager))
 
+    def test_client_manager_factory_selects_the_storage_engine_from_the_environment(self):
+        os.environ[config.STORAGE_ENGINE_VARIABLE] = 'sqlite'
+        try:
+            self.assertTrue(isinstance(ClientManagerFactory.create_storage(), SqliteStorage))
+            os.environ[config.STORAGE_ENGINE_VARIABLE] = 'foo'
+            self.assertRaises(ClickException, ClientManagerFactory.create_storage)
+        finally:
+            del os.environ[config.STORAGE_ENGINE_VARIABLE]
+        self.assertFalse(isinstance(ClientManagerFactory.create_storage(), SqliteStorage))
+
+
+class TestClientImportTime(TestCase):
+    IMPORT_TIME_BUDGET = 150_000
+    HEAVY_MODULES = ['fpdf', 'exporter.pdf_exporter', 'exporter.text_exporter', 'presenter.presenter']
+
+    def import_client(self, code):
+        return subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import cli_client.client; {code}'],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        )
+
+    def test_client_does_not_import_presenter_and_exporters_on_startup(self):
+        result = self.import_client('import sys; print(sorted(sys.modules))')
+        for module in self.HEAVY_MODULES:
+            self.assertNotIn(f"'{module}'", result.stdout)
+
+    def test_client_import_time_stays_within_budget(self):
+        result = self.import_client('pass')
+        cumulative = re.search(r'\|\s*(\d+) \| cli_client\.client$', result.stderr, re.MULTILINE)
+        self.assertLess(int(cumulative.group(1)), self.IMPORT_TIME_BUDGET)
+
 
 class TestClient(TestCase):
     def setUp(self) -> None:
@@ -170,6 +210,20 @@ class TestClient(TestCase):
             self.assertEqual({}, storage)
             ConcreteTasksManager.edit_entry = original_edit_entry
 
+    def test_edit_prints_error_if_new_name_already_exists(self):
+        runner = CliRunner()
+        with runner.isolated_filesystem():
+            def patched_edit(*args, **kwargs):
+                raise UniqueViolationError
+
+            original_edit_entry = ConcreteTasksManager.edit_entry
+            ConcreteTasksManager.edit_entry = patched_edit
+            result = runner.invoke(edit, ['work', 'task'], input='another task')
+            msg = config.EDIT_FAILED.format(new_entry='another task', group='work')
+            self.assertEqual(0, result.exit_code)
+            self.assertTrue(msg in result.output)
+            ConcreteTasksManager.edit_entry = original_edit_entry
+
     def test_edit_outputs_correct_success_text(self):
         runner = CliRunner()
         with runner.isolated_filesystem():
@@ -265,11 +319,12 @@ class TestClient(TestCase):
             def __init__(self, tasks, max_width):
                 TestClient.mock_text_presenter_called = True
 
-            def present(self, only_unfinished_tasks=False):
+            def lines(self, only_unfinished_tasks=False):
                 TestClient.mock_text_presenter_only_unfinished_tasks = only_unfinished_tasks
+                return []
 
-        original_text_presenter = client.TextPresenter
-        client.TextPresenter = MockTextPresenter
+        original_text_presenter = presenter.TextPresenter
+        presenter.TextPresenter = MockTextPresenter
         runner = CliRunner()
         with runner.isolated_filesystem():
             runner.invoke(add, ['work', 'task 1'])
@@ -280,7 +335,7 @@ class TestClient(TestCase):
             runner.invoke(list_entries, ['work', '-u'])
             self.assertTrue(TestClient.mock_text_presenter_called)
             self.assertTrue(TestClient.mock_text_presenter_only_unfinished_tasks)
-        client.TextPresenter = original_text_presenter
+        presenter.TextPresenter = original_text_presenter
 
     def test_finish_helps_outputs_the_help(self):
         runner = CliRunner()
@@ -326,3 +381,229 @@ class TestClient(TestCase):
         global storage
         storage = {}
         ClientManagerFactory.create = self.original_factory
+
+
+class TestBatch(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.original_create_storage = ClientManagerFactory.create_storage
+        ClientManagerFactory.create_storage = lambda **options: SimpleJsonStorageFactory.create(self.directory.name, **options)
+
+    def stored_tasks(self, group):
+        return SimpleJsonStorageFactory.create(self.directory.name).get(group)
+
+    def test_batch_applies_operations_from_stdin_and_reports_each_line(self):
+        operations = '\n'.join([
+            'add work job 1',
+            'add work "job 2"',
+            'add home dishes',
+            'add work job 1',
+            '',
+            'finish work job 1',
+            'undo work job 1',
+            'finish home dish',
+            "edit work 'job 2' second job",
+            'remove work job 1',
+            'remove work job 5',
+            'jump work job 1',
+        ])
+        result = CliRunner().invoke(batch, input=operations)
+        self.assertEqual(0, result.exit_code)
+        expected = [
+            config.ADD_SUCCESS.format(group='work', entry='job 1'),
+            config.ADD_SUCCESS.format(group='work', entry='job 2'),
+            config.ADD_SUCCESS.format(group='home', entry='dishes'),
+            config.ADD_FAILED.format(group='work', entry='job 1'),
+            config.FINISH_SUCCESS.format(entry='job 1'),
+            config.UNDO_SUCCESS.format(entry='job 1'),
+            config.FINISH_SUCCESS.format(entry='dishes'),
+            config.EDIT_SUCCESS.format(entry='job 2', group='work', new_entry='second job'),
+            config.REMOVE_SUCCESS.format(entry='job 1', group='work'),
+            config.FAILED_LOOKUP.format(entry='job 5', group='work'),
+            config.BATCH_INVALID_LINE.format(line=12, operation='jump work job 1'),
+            config.BATCH_SUMMARY.format(applied=8, total=11),
+        ]
+        self.assertEqual(expected, result.output.splitlines())
+        self.assertEqual(['second job'], [task.name for task in self.stored_tasks('work').all()])
+        self.assertTrue(self.stored_tasks('home')['dishes'].done)
+
+    def test_batch_writes_each_touched_group_once(self):
+        writes = []
+        original_put = Storage.put
+
+        def counting_put(storage, tasks):
+            writes.append(tasks.name)
+            original_put(storage, tasks)
+
+        Storage.put = counting_put
+        try:
+            operations = '\n'.join(f'add work job {i}' for i in range(20))
+            result = CliRunner().invoke(batch, input=operations)
+        finally:
+            Storage.put = original_put
+        self.assertEqual(0, result.exit_code)
+        self.assertEqual(['work', 'work'], writes)
+        self.assertEqual(20, self.stored_tasks('work').number_of_tasks)
+
+    def test_batch_adds_consecutive_entries_together_and_reports_duplicates_per_line(self):
+        ClientManagerFactory.create('work').add_entry('job 2')
+        operations = '\n'.join(['add work job 1', 'add work job 2', 'add work job 3', 'add work job 1'])
+        result = CliRunner().invoke(batch, input=operations)
+        self.assertEqual(0, result.exit_code)
+        expected = [
+            config.ADD_SUCCESS.format(group='work', entry='job 1'),
+            config.ADD_FAILED.format(group='work', entry='job 2'),
+            config.ADD_SUCCESS.format(group='work', entry='job 3'),
+            config.ADD_FAILED.format(group='work', entry='job 1'),
+            config.BATCH_SUMMARY.format(applied=2, total=4),
+        ]
+        self.assertEqual(expected, result.output.splitlines())
+        self.assertEqual(['job 2', 'job 1', 'job 3'], [task.name for task in self.stored_tasks('work').all()])
+
+    def test_batch_reads_operations_from_a_file(self):
+        runner = CliRunner()
+        with runner.isolated_filesystem():
+            with open('operations.txt', 'w') as file:
+                file.write('add work job 1\nfinish work job 1\n')
+            result = runner.invoke(batch, ['operations.txt'])
+        self.assertEqual(0, result.exit_code)
+        self.assertTrue(self.stored_tasks('work')['job 1'].done)
+
+    def tearDown(self) -> None:
+        ClientManagerFactory.create_storage = self.original_create_storage
+        self.directory.cleanup()
+
+
+class TestExportAll(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.original_create_storage = ClientManagerFactory.create_storage
+        ClientManagerFactory.create_storage = lambda **options: SimpleJsonStorageFactory.create(self.directory.name, **options)
+
+    def test_export_all_exports_every_group_in_parallel_and_reports_failures(self):
+        ClientManagerFactory.create('work').add_entries(['job 1', 'job 2'])
+        ClientManagerFactory.create('home chores').add_entry('dishes')
+        with open(os.path.join(self.directory.name, 'broken.json'), 'w') as file:
+            file.write('{')
+        output = os.path.join(self.directory.name, 'out')
+        result = CliRunner().invoke(export, ['--all', '--workers', '2', output])
+        self.assertEqual(1, result.exit_code)
+        lines = result.output.splitlines()
+        self.assertTrue(lines[0].startswith(config.EXPORT_FAILED.format(group='broken', error='')))
+        self.assertEqual([
+            config.EXPORT_SUCCESS.format(group='home_chores', path=os.path.join(output, 'home_chores.txt')),
+            config.EXPORT_SUCCESS.format(group='work', path=os.path.join(output, 'work.txt')),
+            config.EXPORT_SUMMARY.format(exported=2, total=3, path=output, unchanged=0),
+        ], lines[1:])
+        with open(os.path.join(output, 'work.txt')) as file:
+            self.assertIn('[ ] job 2', file.read())
+        self.assertNotEqual(0, CliRunner().invoke(export, ['--all', 'work', output]).exit_code)
+        self.assertNotEqual(0, CliRunner().invoke(export, [output]).exit_code)
+
+    def test_export_skips_unchanged_groups_unless_forced(self):
+        manager = ClientManagerFactory.create('work')
+        manager.add_entries(['job 1', 'job 2'])
+        ClientManagerFactory.create('home').add_entry('dishes')
+        output = os.path.join(self.directory.name, 'out')
+        work_path = os.path.join(output, 'work.txt')
+        home_path = os.path.join(output, 'home.txt')
+        self.assertEqual(0, CliRunner().invoke(export, ['--all', output]).exit_code)
+        modified = os.stat(work_path).st_mtime_ns
+
+        result = CliRunner().invoke(export, ['work', output])
+        self.assertEqual(config.EXPORT_UNCHANGED.format(group='work', path=work_path), result.output.strip())
+        self.assertEqual(modified, os.stat(work_path).st_mtime_ns)
+        result = CliRunner().invoke(export, ['work', output, '--width', '30'])
+        self.assertEqual(config.EXPORT_SUCCESS.format(group='work', path=work_path), result.output.strip())
+
+        manager.finish_entry('job 1')
+        result = CliRunner().invoke(export, ['--all', output])
+        self.assertEqual([
+            config.EXPORT_UNCHANGED.format(group='home', path=home_path),
+            config.EXPORT_SUCCESS.format(group='work', path=work_path),
+            config.EXPORT_SUMMARY.format(exported=1, total=2, path=output, unchanged=1),
+        ], result.output.splitlines())
+        result = CliRunner().invoke(export, ['home', output, '--force'])
+        self.assertEqual(config.EXPORT_SUCCESS.format(group='home', path=home_path), result.output.strip())
+        os.remove(home_path)
+        result = CliRunner().invoke(export, ['home', output])
+        self.assertEqual(config.EXPORT_SUCCESS.format(group='home', path=home_path), result.output.strip())
+
+    def test_export_uses_registered_formats(self):
+        ClientManagerFactory.create('work').add_entries(['job 1', 'job 2'])
+        output = os.path.join(self.directory.name, 'out')
+        result = CliRunner().invoke(export, ['--all', '--csv', output])
+        self.assertEqual(0, result.exit_code, result.output)
+        with open(os.path.join(output, 'work.csv')) as file:
+            self.assertEqual(['name,done', 'job 1,0', 'job 2,0'], file.read().splitlines())
+        result = CliRunner().invoke(export, ['work', output, '--format', 'md'])
+        self.assertEqual(0, result.exit_code, result.output)
+        self.assertTrue(os.path.isfile(os.path.join(output, 'work.md')))
+        result = CliRunner().invoke(export, ['work', output, '--format', 'docx'])
+        self.assertEqual(1, result.exit_code)
+        self.assertIn('docx', result.output)
+
+    def tearDown(self) -> None:
+        ClientManagerFactory.create_storage = self.original_create_storage
+        self.directory.cleanup()
+
+
+class TestList(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.original_create_storage = ClientManagerFactory.create_storage
+        ClientManagerFactory.create_storage = lambda **options: SimpleJsonStorageFactory.create(self.directory.name, **options)
+        manager = ClientManagerFactory.create('work')
+        with manager.transaction():
+            for i in range(10):
+                manager.add_entry(f'job {i}')
+                if i % 3 == 0:
+                    manager.finish_entry(f'job {i}')
+
+    def listed_entries(self, result):
+        self.assertEqual(0, result.exit_code)
+        return [line[4:] for line in result.output.splitlines() if line.startswith('[')]
+
+    def test_list_shows_a_page_and_how_to_get_the_next_one(self):
+        result = CliRunner().invoke(list_entries, ['work', '--limit', '3'])
+        self.assertEqual(['job 0', 'job 1', 'job 2'], self.listed_entries(result))
+        self.assertIn(config.LIST_NEXT_PAGE.format(group='work', options='', limit=3, cursor=3), result.output)
+        result = CliRunner().invoke(list_entries, ['work', '--limit', '3', '--cursor', '9'])
+        self.assertEqual(['job 9'], self.listed_entries(result))
+        self.assertNotIn('task list', result.output)
+
+    def test_list_pages_only_unfinished_entries(self):
+        result = CliRunner().invoke(list_entries, ['work', '-u', '-n', '4', '--offset', '1'])
+        self.assertEqual(['job 2', 'job 4', 'job 5', 'job 7'], self.listed_entries(result))
+        self.assertIn(config.LIST_NEXT_PAGE.format(group='work', options=' -u', limit=4, cursor=8), result.output)
+
+    def test_list_sorts_entries_without_changing_the_stored_order(self):
+        manager = ClientManagerFactory.create('work')
+        manager.edit_entry('job 1', 'a job')
+        result = CliRunner().invoke(list_entries, ['work', '--sort', 'name'])
+        self.assertEqual(['a job'] + [f'job {i}' for i in range(10) if i != 1], self.listed_entries(result))
+        result = CliRunner().invoke(list_entries, ['work', '--sort', 'done', '--desc', '-n', '2'])
+        self.assertEqual(['job 0', 'job 3'], self.listed_entries(result))
+        self.assertIn(
+            config.LIST_NEXT_PAGE.format(group='work', options=' --sort done --desc', limit=2, cursor=2), result.output
+        )
+        result = CliRunner().invoke(list_entries, ['work'])
+        self.assertEqual(['job 0', 'a job'] + [f'job {i}' for i in range(2, 10)], self.listed_entries(result))
+
+    def test_status_summarizes_every_group(self):
+        ClientManagerFactory.create('home chores').add_entry('dishes')
+        result = CliRunner().invoke(status)
+        self.assertEqual(0, result.exit_code)
+        expected = [
+            config.STATUS_LINE.format(group='home chores', unfinished=1, finished=0, total=1),
+            config.STATUS_LINE.format(group='work', unfinished=6, finished=4, total=10),
+        ]
+        self.assertEqual(expected, result.output.splitlines())
+
+    def test_list_pager_shows_every_entry(self):
+        result = CliRunner().invoke(list_entries, ['work', '--pager'])
+        self.assertEqual([f'job {i}' for i in range(10)], self.listed_entries(result))
+
+    def tearDown(self) -> None:
+        ClientManagerFactory.create_storage = self.original_create_storage
+        self.directory.cleanup()
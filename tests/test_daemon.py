@@ -0,0 +1,107 @@
+import getpass
+import os
+import tempfile
+import threading
+import time
+from unittest import TestCase, mock
+
+from cli_client import config, daemon
+from cli_client.factory import ClientManagerFactory
+from manager.manager import SimpleTasksManager
+from storage import SimpleJsonStorageFactory
+
+
+class TestDaemon(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.storage_path = os.path.join(self.directory.name, 'storage')
+        self.socket_path = os.path.join(self.directory.name, 'task.sock')
+        self.original_create_storage = ClientManagerFactory.create_storage
+        ClientManagerFactory.create_storage = lambda **options: SimpleJsonStorageFactory.create(self.storage_path, **options)
+        self.cwd = os.getcwd()
+
+    def start_server(self, flush_interval=60.0):
+        self.server = threading.Thread(target=daemon.serve, args=(self.socket_path, flush_interval))
+        self.server.start()
+        while daemon.request({'command': 'ping'}, self.socket_path) is None:
+            time.sleep(0.01)
+
+    def stop_server(self):
+        daemon.request({'command': 'stop'}, self.socket_path)
+        self.server.join()
+
+    def stored_tasks(self):
+        return SimpleJsonStorageFactory.create(self.storage_path).get('work')
+
+    def test_forward_returns_none_when_no_server_is_running(self):
+        self.assertIsNone(daemon.forward(['add', 'work', 'job 1'], self.socket_path))
+
+    def test_server_runs_forwarded_commands_and_keeps_changes_until_flushed(self):
+        self.start_server()
+        response = daemon.forward(['add', 'work', 'job', '1'], self.socket_path)
+        self.assertEqual(0, response['exit_code'])
+        self.assertIn(config.ADD_SUCCESS.format(group='work', entry='job 1'), response['output'])
+        response = daemon.forward(['finish', 'work', 'job'], self.socket_path)
+        self.assertIn(config.FINISH_SUCCESS.format(entry='job 1'), response['output'])
+        self.assertEqual(0, self.stored_tasks().number_of_tasks)
+        self.stop_server()
+        tasks = self.stored_tasks()
+        self.assertTrue(tasks['job 1'].done)
+        self.assertFalse(os.path.exists(self.socket_path))
+
+    def test_server_flushes_pending_changes_after_the_flush_interval(self):
+        self.start_server(flush_interval=0.05)
+        daemon.forward(['add', 'work', 'job 1'], self.socket_path)
+        deadline = time.monotonic() + 5
+        while self.stored_tasks().number_of_tasks == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(1, self.stored_tasks().number_of_tasks)
+        self.stop_server()
+
+    def test_release_flushes_and_drops_the_groups_held_in_memory(self):
+        self.start_server()
+        daemon.forward(['add', 'work', 'job 1'], self.socket_path)
+        daemon.request({'command': 'release'}, self.socket_path)
+        self.assertEqual(1, self.stored_tasks().number_of_tasks)
+        storage = SimpleJsonStorageFactory.create(self.storage_path)
+        tasks = storage.get('work')
+        tasks.add('job 2')
+        storage.put(tasks)
+        response = daemon.forward(['remove', 'work', 'job 2'], self.socket_path)
+        self.assertIn(config.REMOVE_SUCCESS.format(entry='job 2', group='work'), response['output'])
+        self.stop_server()
+        self.assertFalse(self.stored_tasks().has('job 2'))
+
+    def test_server_keeps_changes_made_outside_of_it(self):
+        self.start_server()
+        daemon.forward(['add', 'work', 'job 1'], self.socket_path)
+        daemon.request({'command': 'release'}, self.socket_path)
+        daemon.forward(['finish', 'work', 'job 1'], self.socket_path)
+        outside = SimpleTasksManager('work', SimpleJsonStorageFactory.create(self.storage_path))
+        outside.add_entry('job 2')
+        response = daemon.forward(['add', 'work', 'job 3'], self.socket_path)
+        self.assertEqual(0, response['exit_code'])
+        outside.add_entry('job 4')
+        outside.delete_entry('job 2')
+        daemon.forward(['add', 'work', 'job 5'], self.socket_path)
+        self.stop_server()
+        tasks = self.stored_tasks()
+        self.assertEqual(['job 1', 'job 4', 'job 3', 'job 5'], [task.name for task in tasks.ordered()])
+        self.assertTrue(tasks['job 1'].done)
+
+    def test_default_socket_path_does_not_need_a_user_name(self):
+        original_getuser = getpass.getuser
+        getpass.getuser = lambda: {}['user']
+        try:
+            with mock.patch.dict(os.environ, {'XDG_RUNTIME_DIR': self.directory.name}):
+                os.environ.pop(config.SOCKET_VARIABLE, None)
+                self.assertEqual(
+                    os.path.join(self.directory.name, f'task-{os.getuid()}.sock'), daemon.default_socket_path()
+                )
+        finally:
+            getpass.getuser = original_getuser
+
+    def tearDown(self) -> None:
+        os.chdir(self.cwd)
+        ClientManagerFactory.create_storage = self.original_create_storage
+        self.directory.cleanup()
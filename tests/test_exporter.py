@@ -0,0 +1,96 @@
+import os
+import re
+import tempfile
+from unittest import TestCase
+
+from exporter.csv_exporter import CSVExporter
+from exporter.jsonl_exporter import JSONLExporter
+from exporter.markdown_exporter import MarkdownExporter
+from exporter.pdf_exporter import FontMetrics, PDFContext, PDFExporter
+from exporter.registry import formats, get_exporter
+from tasks import SimpleTasks
+
+
+class TestFontMetrics(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        FontMetrics._loaded.clear()
+
+    def test_font_metrics_are_parsed_once_and_persisted_by_font_hash(self):
+        metrics = FontMetrics(cache_dir=self.directory.name)
+        loaded = metrics.load()
+        self.assertIs(loaded, metrics.load())
+        cached, = os.listdir(self.directory.name)
+        self.assertTrue(cached.endswith('.metrics'))
+        FontMetrics._loaded.clear()
+        metrics._parse = None
+        self.assertEqual(loaded, metrics.load())
+
+    def test_pdf_context_exports_many_documents_outside_the_package_directory(self):
+        context = PDFContext(metrics=FontMetrics(cache_dir=self.directory.name))
+        cwd = os.getcwd()
+        os.chdir(self.directory.name)
+        try:
+            for name in ['work', 'home']:
+                exporter = PDFExporter('out', name, context=context)
+                exporter.export('[ ] job 1\n[x] job 2')
+                with open(exporter.path, 'rb') as file:
+                    self.assertTrue(file.read().startswith(b'%PDF'))
+        finally:
+            os.chdir(cwd)
+
+    def test_pdf_exporter_streams_lines_onto_as_many_pages_as_needed(self):
+        context = PDFContext(metrics=FontMetrics(cache_dir=self.directory.name))
+        lines = [f'[ ] job {i}' for i in range(100)] + ['[x] ' + 'very long entry ' * 20]
+        streamed = PDFExporter(self.directory.name, 'streamed', context=context)
+        streamed.export(line for line in lines)
+        joined = PDFExporter(self.directory.name, 'joined', context=context)
+        joined.export('\n'.join(lines))
+        pages = []
+        for exporter in [streamed, joined]:
+            with open(exporter.path, 'rb') as file:
+                pages.append(len(re.findall(rb'/Type /Page\b', file.read())))
+        self.assertEqual(pages[0], pages[1])
+        self.assertEqual(5, pages[0])
+
+    def tearDown(self) -> None:
+        FontMetrics._loaded.clear()
+        self.directory.cleanup()
+
+
+class TestTasksExporters(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.tasks = SimpleTasks('Work')
+        self.tasks.extend([('job, "one"', True), ('fix *bold* [link]', False)])
+
+    def read(self, exporter):
+        exporter.export(self.tasks)
+        with open(exporter.path, encoding='utf-8') as file:
+            return file.read()
+
+    def test_csv_exporter_writes_name_and_done_columns(self):
+        content = self.read(CSVExporter(self.directory.name, 'work'))
+        self.assertEqual('name,done\n"job, ""one""",1\nfix *bold* [link],0\n', content)
+
+    def test_jsonl_exporter_writes_one_task_per_line(self):
+        content = self.read(JSONLExporter(self.directory.name, 'work'))
+        self.assertEqual([
+            '{"name": "job, \\"one\\"", "done": true}',
+            '{"name": "fix *bold* [link]", "done": false}',
+        ], content.splitlines())
+
+    def test_markdown_exporter_writes_an_escaped_checklist(self):
+        content = self.read(MarkdownExporter(self.directory.name, 'work'))
+        self.assertEqual([
+            '# Work', '', '- [x] job, "one"', '- [ ] fix \\*bold\\* \\[link\\]'
+        ], content.splitlines())
+
+    def test_registry_resolves_builtin_formats_lazily(self):
+        self.assertTrue({'txt', 'pdf', 'csv', 'jsonl', 'md'} <= set(formats()))
+        self.assertIs(CSVExporter, get_exporter('csv'))
+        with self.assertRaises(LookupError):
+            get_exporter('docx')
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
@@ -1,8 +1,10 @@
+import fcntl
 import json
 import os
+import tempfile
 from unittest import TestCase
 
-from storage.io import JsonIO, IO
+from storage.io import BinaryIO, JsonIO, IO, JsonLinesIO, SqliteIO
 
 
 class TestIO(TestCase):
@@ -60,5 +62,150 @@ class TestJsonIO(TestCase):
         file.close()
         os.remove(path)
 
+    def test_compact_json_io_saves_without_whitespace(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'work.json')
+            JsonIO(compact=True).save_to({"group": "work", "tasks": [["job 1", True]]}, path)
+            with open(path) as file:
+                self.assertEqual('{"group":"work","tasks":[["job 1",true]]}', file.read())
+            self.assertEqual({"group": "work", "tasks": [["job 1", True]]}, JsonIO().load_from(path))
+
     def test_json_io_gives_the_correct_extension(self):
         self.assertEqual('.json', JsonIO().extension.lower())
+
+    def test_json_io_save_to_keeps_the_old_file_when_writing_fails(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'work.json')
+            JsonIO().save_to({"foo": "bar"}, path)
+            self.assertRaises(TypeError, JsonIO().save_to, {"foo": object()}, path)
+            self.assertEqual({"foo": "bar"}, JsonIO().load_from(path))
+            self.assertEqual(['work.json'], os.listdir(directory))
+
+    def test_json_io_lock_is_held_until_the_context_exits(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'work.json')
+            with JsonIO().lock(path):
+                with open(path + '.lock') as lock_file:
+                    self.assertRaises(BlockingIOError, fcntl.flock, lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            with open(path + '.lock') as lock_file:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    def test_json_io_lock_is_reentrant_within_a_process(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'work.json')
+            with JsonIO().lock(path), JsonIO().lock(path):
+                pass
+            with JsonIO().lock(path):
+                with open(path + '.lock') as lock_file:
+                    self.assertRaises(BlockingIOError, fcntl.flock, lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            with open(path + '.lock') as lock_file:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+
+class TestSqliteIO(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'work.sqlite3')
+
+    def test_sqlite_io_correctly_saves_and_loads_a_group(self):
+        content = ('work', [('job 1', True), ('job 2', False)])
+        SqliteIO().save_to(content, self.path)
+        self.assertEqual(content, SqliteIO().load_from(self.path))
+
+    def test_sqlite_io_raise_file_not_found_if_file_not_available(self):
+        self.assertRaises(FileNotFoundError, SqliteIO().load_from, self.path)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_sqlite_io_save_row_appends_new_rows_and_updates_existing_ones(self):
+        io = SqliteIO()
+        io.save_to(('work', [('job 1', False)]), self.path)
+        io.save_row('work', 'job 2', False, self.path)
+        io.save_row('work', 'job 1', True, self.path)
+        self.assertEqual(('work', [('job 1', True), ('job 2', False)]), io.load_from(self.path))
+
+    def test_sqlite_io_rename_row_and_delete_row_change_only_the_given_row(self):
+        io = SqliteIO()
+        io.save_to(('work', [('job 1', False), ('job 2', True), ('job 3', False)]), self.path)
+        io.rename_row('work', 'job 2', 'second job', self.path)
+        io.delete_row('work', 'job 1', self.path)
+        self.assertEqual(('work', [('second job', True), ('job 3', False)]), io.load_from(self.path))
+
+    def test_sqlite_io_lock_serializes_whole_group_writes_with_row_writers(self):
+        with SqliteIO().lock(self.path):
+            with open(self.path + '.lock') as lock_file:
+                self.assertRaises(BlockingIOError, fcntl.flock, lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    def test_sqlite_io_gives_the_correct_extension(self):
+        self.assertEqual('.sqlite3', SqliteIO().extension.lower())
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+
+class TestJsonLinesIO(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'work.log')
+
+    def test_json_lines_io_correctly_saves_loads_and_appends_entries(self):
+        io = JsonLinesIO()
+        io.save_to([{'op': 'put'}], self.path)
+        io.append_to({'op': 'delete'}, self.path)
+        self.assertEqual([{'op': 'put'}, {'op': 'delete'}], io.load_from(self.path))
+
+    def test_json_lines_io_ignores_a_partially_written_last_line(self):
+        with open(self.path, 'w') as file:
+            file.write('{"op": "put"}\n{"op": "del')
+        self.assertEqual([{'op': 'put'}], JsonLinesIO().load_from(self.path))
+
+    def test_json_lines_io_raise_file_not_found_if_file_not_available(self):
+        self.assertRaises(FileNotFoundError, JsonLinesIO().load_from, self.path)
+
+    def test_json_lines_io_gives_the_correct_extension(self):
+        self.assertEqual('.log', JsonLinesIO().extension.lower())
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+
+class TestBinaryIO(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'work.tasks')
+        self.rows = [(f'job {i}', i % 3 == 0) for i in range(20)] + [('kāR 🎉', False)]
+
+    def test_binary_io_correctly_saves_and_loads_a_group(self):
+        BinaryIO().save_to(('work', self.rows), self.path)
+        with BinaryIO().load_from(self.path) as group:
+            self.assertEqual('work', group.name)
+            self.assertEqual(len(self.rows), group.count)
+            self.assertEqual(self.rows, list(group))
+
+    def test_binary_io_save_done_flips_a_single_flag_in_place(self):
+        io = BinaryIO()
+        io.save_to(('work', self.rows), self.path)
+        inode = os.stat(self.path).st_ino
+        self.assertTrue(io.save_done(1, 'job 1', True, self.path))
+        self.assertTrue(io.save_done(3, 'job 3', False, self.path))
+        self.assertEqual(inode, os.stat(self.path).st_ino)
+        with io.load_from(self.path) as group:
+            self.assertTrue(group.done(1))
+            self.assertFalse(group.done(3))
+            self.assertEqual(self.rows[4:], list(group)[4:])
+
+    def test_binary_io_save_done_refuses_to_flip_a_flag_of_another_task(self):
+        io = BinaryIO()
+        io.save_to(('work', self.rows), self.path)
+        self.assertFalse(io.save_done(1, 'job 2', True, self.path))
+        self.assertFalse(io.save_done(len(self.rows), 'job 50', True, self.path))
+        with io.load_from(self.path) as group:
+            self.assertEqual(self.rows, list(group))
+
+    def test_binary_io_raise_file_not_found_if_file_not_available(self):
+        self.assertRaises(FileNotFoundError, BinaryIO().load_from, self.path)
+
+    def test_binary_io_gives_the_correct_extension(self):
+        self.assertEqual('.tasks', BinaryIO().extension.lower())
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
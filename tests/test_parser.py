@@ -1,6 +1,7 @@
 from unittest import TestCase
 
-from storage.parser import SimpleJsonParser
+from storage.io import BinaryGroup
+from storage.parser import BinaryParser, SimpleJsonParser, SqliteParser
 from tasks import SimpleTasks
 
 
@@ -62,3 +63,61 @@ class TestSimpleJsonParser(TestCase):
         tasks['Job 1'].finish()
         tasks['Job 3'].finish()
         self.assertEqual(tasks, SimpleJsonParser().load(content))
+
+    def test_compact_json_parser_dump_creates_name_and_done_pairs(self):
+        tasks = SimpleTasks('work')
+        tasks.add('Job 1')
+        tasks.add('Job 2')
+        tasks['Job 2'].finish()
+        expected = {"group": "work", "tasks": [["Job 1", False], ["Job 2", True]]}
+        self.assertEqual(expected, SimpleJsonParser(compact=True).dump(tasks))
+
+    def test_json_parser_dump_keeps_insertion_order_of_sorted_tasks(self):
+        tasks = SimpleTasks('work')
+        tasks.add('Job 2')
+        tasks.add('Job 1')
+        tasks['Job 2'].finish()
+        tasks.sort_by_name()
+        expected = {"group": "work", "tasks": [["Job 2", True], ["Job 1", False]]}
+        self.assertEqual(expected, SimpleJsonParser(compact=True).dump(tasks))
+
+    def test_json_parser_load_reads_both_the_compact_and_the_verbose_layout(self):
+        tasks = SimpleTasks('work')
+        tasks.add('Job 1')
+        tasks.add('Job 2')
+        tasks['Job 2'].finish()
+        for parser in [SimpleJsonParser(), SimpleJsonParser(compact=True)]:
+            for dumper in [SimpleJsonParser(), SimpleJsonParser(compact=True)]:
+                self.assertEqual(tasks, parser.load(dumper.dump(tasks)))
+
+
+class TestSqliteParser(TestCase):
+    def test_sqlite_parser_loads_empty_loads_an_empty_simple_tasks(self):
+        tasks = SqliteParser().load_empty('work')
+        self.assertTrue(isinstance(tasks, SimpleTasks))
+        self.assertEqual('work', tasks.name)
+        self.assertEqual([], tasks.all())
+
+    def test_sqlite_parser_dump_correctly_creates_rows_from_tasks(self):
+        tasks = SimpleTasks('work')
+        tasks.add('Job 1')
+        tasks.add('Job 2')
+        tasks['Job 1'].finish()
+        self.assertEqual(('work', [('Job 1', True), ('Job 2', False)]), SqliteParser().dump(tasks))
+
+    def test_sqlite_parser_load_creates_tasks_correctly(self):
+        tasks = SimpleTasks('work')
+        tasks.add('Job 1')
+        tasks.add('Job 2')
+        tasks['Job 2'].finish()
+        self.assertEqual(tasks, SqliteParser().load(('work', [('Job 1', False), ('Job 2', True)])))
+
+
+class TestBinaryParser(TestCase):
+    def test_binary_parser_load_creates_tasks_from_a_binary_group(self):
+        tasks = SimpleTasks('work')
+        tasks.add('Job 1')
+        tasks.add('Job 2')
+        tasks['Job 2'].finish()
+        group = BinaryGroup(bytearray(BinaryGroup.pack(*BinaryParser().dump(tasks))))
+        self.assertEqual(tasks, BinaryParser().load(group))
@@ -67,3 +67,42 @@ class TestPresenter(TestCase):
                    '    wrapping!\n' \
                    '==================='
         self.assertEqual(expected, TextPresenter(tasks, 19).present())
+
+    def test_text_presenter_lines_streams_the_same_output_as_present(self):
+        tasks = SimpleTasks('work')
+        tasks.add('this is a long text that needs wrapping!')
+        tasks.add('short one')
+        tasks.add('  padded text    ')
+        tasks.add('a finished task that is wider than the rest')
+        tasks['a finished'].finish()
+        for only_unfinished_tasks in [False, True]:
+            for width in [17, 19, 60]:
+                presenter = TextPresenter(tasks, width)
+                lines = list(presenter.lines(only_unfinished_tasks=only_unfinished_tasks))
+                expected = TextPresenter(tasks, width).present(only_unfinished_tasks=only_unfinished_tasks)
+                self.assertEqual(expected, '\n'.join(lines))
+
+    def test_text_presenter_width_counts_finished_tasks_even_when_they_are_hidden(self):
+        tasks = SimpleTasks('work')
+        tasks.add('tasks 1')
+        tasks.add('a much longer finished task')
+        tasks['a much'].finish()
+        expected = '    Work\n' \
+                   '===============================\n' \
+                   '[ ] tasks 1\n' \
+                   '==============================='
+        self.assertEqual(expected, TextPresenter(tasks, 60).present(only_unfinished_tasks=True))
+        self.assertEqual(expected, '\n'.join(TextPresenter(tasks, 60).lines(only_unfinished_tasks=True)))
+
+    def test_text_presenter_lines_renders_only_the_given_tasks(self):
+        tasks = SimpleTasks('work')
+        tasks.add('a much longer task name')
+        tasks.add('tasks 2')
+        tasks.add('tasks 3')
+        expected = '    Work\n' \
+                   '===========\n' \
+                   '[ ] tasks 2\n' \
+                   '[ ] tasks 3\n' \
+                   '==========='
+        page, _ = tasks.window(offset=1)
+        self.assertEqual(expected, '\n'.join(TextPresenter(tasks, 60).lines(tasks=page)))
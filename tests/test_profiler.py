@@ -0,0 +1,58 @@
+import json
+import os
+import tempfile
+from unittest import TestCase
+
+from click.testing import CliRunner
+
+import profiler
+from cli_client.client import task
+from cli_client.factory import ClientManagerFactory
+from storage import SimpleJsonStorageFactory
+from storage.cache import shared_cache
+
+
+class TestProfiler(TestCase):
+    def tearDown(self) -> None:
+        profiler.stop()
+
+    def test_stage_does_nothing_when_profiling_is_off(self):
+        with profiler.stage(profiler.READ):
+            pass
+        self.assertIsNone(profiler.active())
+        self.assertIsNone(profiler.stop())
+
+    def test_nested_stages_record_only_their_own_time(self):
+        profile = profiler.start()
+        with profiler.stage(profiler.WRITE):
+            with profiler.stage(profiler.DUMP):
+                blocks = [object() for _ in range(100)]
+        self.assertIs(profile, profiler.stop())
+        self.assertEqual({profiler.WRITE, profiler.DUMP}, set(profile.stages))
+        self.assertEqual(1, profile.stages[profiler.DUMP]['calls'])
+        self.assertGreaterEqual(profile.stages[profiler.DUMP]['allocated_blocks'], len(blocks))
+        self.assertLess(profile.stages[profiler.WRITE]['allocated_blocks'], len(blocks))
+        total = sum(stage['seconds'] for stage in profile.stages.values())
+        self.assertLessEqual(total, profile.total)
+
+    def test_task_profile_trace_writes_every_stage_of_a_command(self):
+        original_create_storage = ClientManagerFactory.create_storage
+        with tempfile.TemporaryDirectory() as directory:
+            ClientManagerFactory.create_storage = lambda **options: SimpleJsonStorageFactory.create(directory, **options)
+            try:
+                trace = os.path.join(directory, 'trace.json')
+                cprofile = os.path.join(directory, 'task.prof')
+                CliRunner().invoke(task, ['add', 'work', 'job'])
+                shared_cache.clear()
+                result = CliRunner().invoke(
+                    task, ['--profile-trace', trace, '--profile-cprofile', cprofile, 'remove', 'work', 'jo']
+                )
+                self.assertEqual(0, result.exit_code)
+                with open(trace) as file:
+                    stages = json.load(file)['stages']
+                expected = {profiler.READ, profiler.PARSE, profiler.LOOKUP, profiler.MUTATE, profiler.DUMP,
+                            profiler.WRITE}
+                self.assertEqual(expected, set(stages))
+                self.assertTrue(os.path.getsize(cprofile))
+            finally:
+                ClientManagerFactory.create_storage = original_create_storage
@@ -1,12 +1,19 @@
 import os
+import tempfile
 from unittest import TestCase
 
-from storage import SimpleJsonStorageFactory
+from storage import (
+    SimpleJsonStorageFactory, CompactJsonStorageFactory, SqliteStorageFactory, JournalStorageFactory,
+    BinaryStorageFactory
+)
 from storage.abstract import Parser
-from storage.io import IO, JsonIO
-from storage.parser import SimpleJsonParser
-from storage.storage import Storage
-from tasks import Tasks, SimpleTasks
+from storage.io import BinaryIO, IO, JsonIO, JsonLinesIO, SqliteIO
+from storage.parser import BinaryParser, SimpleJsonParser, SqliteParser
+from storage.cache import GroupCache
+from storage.storage import (
+    Storage, BinaryStorage, CachedStorage, JournalStorage, SqliteStorage, WriteBehindStorage
+)
+from tasks import CompactTasks, Tasks, SimpleTasks
 
 
 class StubIO(IO):
@@ -64,6 +71,16 @@ class TestStorage(TestCase):
         self.assertEqual('Stub Job 1', tasks.all()[0].name)
         self.assertEqual('Stub Job 2', tasks.all()[1].name)
 
+    def test_storage_names_lists_the_stored_groups(self):
+        with tempfile.TemporaryDirectory() as directory:
+            storage = SimpleJsonStorageFactory.create(directory)
+            storage.put(SimpleTasks('work'))
+            storage.put(SimpleTasks('home chores'))
+            with storage.lock('work'):
+                pass
+            open(os.path.join(directory, '.tmp.json'), 'w').close()
+            self.assertEqual(['home_chores', 'work'], storage.names())
+
     def test_storage_path_gives_the_correct_path_to_the_storage_of_a_given_tasks(self):
         storage = Storage(StubParser(), StubIO(), '.')
         self.assertEqual('./foo.stub', storage.path('foo'))
@@ -77,3 +94,282 @@ class TestSimpleJsonStorageFactory(TestCase):
         self.assertTrue(isinstance(storage.parser, Parser))
         self.assertTrue(isinstance(storage.io, JsonIO))
         self.assertTrue(isinstance(storage.parser, SimpleJsonParser))
+
+
+class TestCompactJsonStorageFactory(TestCase):
+    def test_compact_json_storage_factory_uses_compact_json_io_and_compact_json_parser(self):
+        storage = CompactJsonStorageFactory.create('.')
+        self.assertTrue(isinstance(storage.io, JsonIO))
+        self.assertTrue(isinstance(storage.parser, SimpleJsonParser))
+        self.assertTrue(storage.io.compact)
+        self.assertTrue(storage.parser.compact)
+
+    def test_compact_json_storage_reads_groups_written_in_the_verbose_layout(self):
+        with tempfile.TemporaryDirectory() as directory:
+            tasks = SimpleTasks('work')
+            tasks.add('job 1')
+            tasks['job 1'].finish()
+            SimpleJsonStorageFactory.create(directory).put(tasks)
+            self.assertEqual(tasks, CompactJsonStorageFactory.create(directory).get('work'))
+
+
+class TestSqliteStorage(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.storage = SqliteStorageFactory.create(self.directory.name)
+
+    def test_sqlite_storage_writes_single_rows_without_rewriting_the_group(self):
+        tasks = self.storage.get('work')
+        tasks.add('job 1')
+        self.storage.put_task(tasks, 'job 1')
+        tasks.add('job 2')
+        self.storage.put_task(tasks, 'job 2')
+        self.storage.io.save_to = None
+        tasks['job 1'].finish()
+        self.storage.put_task(tasks, 'job 1')
+        tasks['job 2'] = 'second job'
+        self.storage.rename_task(tasks, 'job 2', 'second job')
+        self.assertEqual(tasks, self.storage.get('work'))
+        tasks.delete('job 1')
+        self.storage.delete_task(tasks, 'job 1')
+        self.assertEqual(tasks, self.storage.get('work'))
+
+    def test_sqlite_storage_get_creates_an_empty_group_if_not_existing(self):
+        tasks = self.storage.get('work group')
+        self.assertEqual('work group', tasks.name)
+        self.assertEqual(0, tasks.number_of_tasks)
+        self.assertTrue(os.path.isfile(os.path.join(self.directory.name, 'work_group.sqlite3')))
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+
+class TestSqliteStorageFactory(TestCase):
+    def test_sqlite_storage_factory_uses_sqlite_io_and_sqlite_parser_to_create_a_storage(self):
+        storage = SqliteStorageFactory.create('.')
+        self.assertTrue(isinstance(storage, SqliteStorage))
+        self.assertTrue(isinstance(storage.io, SqliteIO))
+        self.assertTrue(isinstance(storage.parser, SqliteParser))
+
+
+class TestJournalStorage(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.storage = JournalStorageFactory.create(self.directory.name)
+        self.journal_path = os.path.join(self.directory.name, 'work.log')
+
+    def test_journal_storage_appends_operations_and_replays_them_on_get(self):
+        tasks = self.storage.get('work')
+        tasks.add('job 1')
+        self.storage.put_task(tasks, 'job 1')
+        tasks.add('job 2')
+        self.storage.put_task(tasks, 'job 2')
+        tasks.add('job 3')
+        self.storage.put_task(tasks, 'job 3')
+        tasks['job 1'].finish()
+        self.storage.put_task(tasks, 'job 1')
+        tasks['job 2'] = 'second job'
+        self.storage.rename_task(tasks, 'job 2', 'second job')
+        tasks.delete('job 3')
+        self.storage.delete_task(tasks, 'job 3')
+        self.assertEqual(6, len(self.storage.journal_io.load_from(self.journal_path)))
+        self.assertEqual(tasks, self.storage.get('work'))
+
+    def test_journal_storage_put_writes_a_snapshot_and_drops_the_journal(self):
+        tasks = self.storage.get('work')
+        tasks.add('job 1')
+        self.storage.put_task(tasks, 'job 1')
+        self.assertTrue(os.path.isfile(self.journal_path))
+        self.storage.put(tasks)
+        self.assertFalse(os.path.isfile(self.journal_path))
+        self.assertEqual(tasks, self.storage.get('work'))
+
+    def test_journal_storage_compacts_the_journal_once_it_passes_the_threshold(self):
+        self.storage.compaction_threshold = 100
+        tasks = self.storage.get('work')
+        for i in range(10):
+            tasks.add(f'job {i}')
+            self.storage.put_task(tasks, f'job {i}')
+            if os.path.isfile(self.journal_path):
+                self.assertTrue(os.path.getsize(self.journal_path) <= 100)
+        self.assertEqual(tasks, self.storage.get('work'))
+
+    def test_journal_storage_replay_skips_operations_on_missing_entries(self):
+        tasks = self.storage.get('work')
+        tasks.add('job 1')
+        self.storage.put(tasks)
+        self.storage.journal_io.save_to([
+            {'op': 'rename', 'name': 'job 2', 'new_name': 'second job'},
+            {'op': 'delete', 'name': 'job 3'},
+            {'op': 'put', 'name': 'job 1', 'done': True},
+        ], self.journal_path)
+        tasks['job 1'].finish()
+        self.assertEqual(tasks, self.storage.get('work'))
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+
+class TestJournalStorageFactory(TestCase):
+    def test_journal_storage_factory_uses_json_io_and_json_lines_io_to_create_a_storage(self):
+        storage = JournalStorageFactory.create('.')
+        self.assertTrue(isinstance(storage, JournalStorage))
+        self.assertTrue(isinstance(storage.io, JsonIO))
+        self.assertTrue(isinstance(storage.journal_io, JsonLinesIO))
+        self.assertTrue(isinstance(storage.parser, SimpleJsonParser))
+
+
+class TestBinaryStorage(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.storage = BinaryStorageFactory.create(self.directory.name)
+
+    def test_binary_storage_flips_done_flags_in_place(self):
+        tasks = self.storage.get('work')
+        tasks.add('job 1')
+        self.storage.put_task(tasks, 'job 1')
+        tasks.add('job 2')
+        self.storage.put_task(tasks, 'job 2')
+        self.storage.put = None
+        tasks['job 2'].finish()
+        self.storage.put_task(tasks, 'job 2')
+        self.assertEqual(tasks, self.storage.get('work'))
+
+    def test_binary_storage_flips_done_flags_of_compact_tasks_in_place(self):
+        tasks = CompactTasks.from_records('work', [(f'job {i}', False) for i in range(4)])
+        tasks.delete('job 1')
+        self.storage.put(tasks)
+        self.storage.put = None
+        tasks['job 3'].finish()
+        self.storage.put_task(tasks, 'job 3')
+        self.assertEqual(tasks, self.storage.get('work'))
+
+    def test_binary_storage_rewrites_the_group_on_rename_and_delete(self):
+        tasks = self.storage.get('work')
+        for name in ['job 1', 'job 2', 'job 3']:
+            tasks.add(name)
+            self.storage.put_task(tasks, name)
+        tasks['job 1'] = 'first job'
+        self.storage.rename_task(tasks, 'job 1', 'first job')
+        tasks.delete('job 2')
+        self.storage.delete_task(tasks, 'job 2')
+        self.assertEqual(tasks, self.storage.get('work'))
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+
+class TestBinaryStorageFactory(TestCase):
+    def test_binary_storage_factory_uses_binary_io_and_binary_parser_to_create_a_storage(self):
+        storage = BinaryStorageFactory.create('.')
+        self.assertTrue(isinstance(storage, BinaryStorage))
+        self.assertTrue(isinstance(storage.io, BinaryIO))
+        self.assertTrue(isinstance(storage.parser, BinaryParser))
+
+
+class TestWriteBehindStorage(TestCase):
+    def setUp(self) -> None:
+        self.storage = Storage(SimpleJsonParser(), StubIO(), '.')
+        self.write_behind = WriteBehindStorage(self.storage)
+
+    def test_write_behind_storage_keeps_changes_in_memory_until_flushed(self):
+        self.storage.put(SimpleTasks('work'))
+        tasks = self.write_behind.get('work')
+        self.assertIs(tasks, self.write_behind.get('work'))
+        tasks.add('job 1')
+        self.write_behind.put_task(tasks, 'job 1')
+        tasks.add('job 2')
+        self.write_behind.put_task(tasks, 'job 2')
+        self.assertEqual(1, self.write_behind.pending)
+        self.assertEqual(0, self.storage.get('work').number_of_tasks)
+        self.write_behind.flush()
+        self.assertEqual(0, self.write_behind.pending)
+        self.assertEqual(tasks, self.storage.get('work'))
+
+    def test_write_behind_storage_release_reloads_groups_from_the_wrapped_storage(self):
+        self.storage.put(SimpleTasks('work'))
+        tasks = self.write_behind.get('work')
+        self.write_behind.release()
+        self.assertIsNot(tasks, self.write_behind.get('work'))
+
+
+class TestParseCache(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.storage = CompactJsonStorageFactory.create(self.directory.name, parse_cache=True)
+        tasks = SimpleTasks('work')
+        tasks.add('job 2')
+        tasks.add('job 1').finish()
+        self.storage.put(tasks)
+        self.expected = tasks
+
+    def test_parse_cache_is_written_on_read_and_used_while_the_group_is_unchanged(self):
+        self.assertEqual(self.expected, self.storage.get('work'))
+        cache_path = self.storage.parse_cache_path(self.storage.file_path('work'))
+        self.assertTrue(os.path.isfile(cache_path))
+        self.assertEqual(['work'], self.storage.names())
+        self.storage.parser.load = None
+        tasks = self.storage.get('work')
+        self.assertEqual(self.expected, tasks)
+        self.assertEqual(['job 1', 'job 2'], [task.name for task in tasks.ordered('name')])
+        self.assertEqual(['job 1'], [task.name for task in tasks.finished()])
+
+    def test_stale_or_broken_parse_cache_is_rebuilt(self):
+        self.storage.get('work')
+        self.expected.add('job 3')
+        self.storage.put(self.expected)
+        self.assertEqual(self.expected, self.storage.get('work'))
+        with open(self.storage.parse_cache_path(self.storage.file_path('work')), 'wb') as file:
+            file.write(b'garbage')
+        self.assertEqual(self.expected, self.storage.get('work'))
+        self.assertEqual(self.expected, self.storage.get('work'))
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+
+class TestCachedStorage(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.storage = JournalStorageFactory.create(self.directory.name)
+        self.cache = GroupCache()
+        self.cached = CachedStorage(self.storage, self.cache)
+        self.storage.put(SimpleTasks('work'))
+
+    def test_cached_storage_parses_a_group_once_while_its_files_are_unchanged(self):
+        tasks = self.cached.get('work')
+        self.assertIs(tasks, self.cached.get('work'))
+        self.assertEqual({'hits': 1, 'misses': 1, 'entries': 1}, {
+            key: value for key, value in self.cache.stats().items() if key != 'bytes'
+        })
+
+    def test_cached_storage_reloads_a_group_changed_by_another_writer(self):
+        tasks = self.cached.get('work')
+        other = self.storage.get('work')
+        other.add('job 1')
+        self.storage.put_task(other, 'job 1')
+        self.assertIsNot(tasks, self.cached.get('work'))
+        self.assertTrue(self.cached.get('work').has('job 1'))
+
+    def test_cached_storage_keeps_the_written_group_after_a_write(self):
+        tasks = self.cached.get('work')
+        tasks.add('job 1')
+        self.cached.put_task(tasks, 'job 1')
+        self.assertIs(tasks, self.cached.get('work'))
+        self.assertEqual(tasks, self.storage.get('work'))
+        self.cached.invalidate('work')
+        self.assertIsNot(tasks, self.cached.get('work'))
+
+    def test_group_cache_evicts_the_least_recently_used_groups_past_its_caps(self):
+        cache = GroupCache(max_entries=2, max_bytes=100)
+        cache.store('a', ((1, 40, 1),), SimpleTasks('a'))
+        cache.store('b', ((1, 40, 2),), SimpleTasks('b'))
+        self.assertIsNotNone(cache.get('a', ((1, 40, 1),)))
+        cache.store('c', ((1, 40, 3),), SimpleTasks('c'))
+        self.assertIsNone(cache.get('b', ((1, 40, 2),)))
+        self.assertEqual(80, cache.size)
+        cache.store('d', ((1, 101, 4),), SimpleTasks('d'))
+        self.assertEqual(2, len(cache))
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
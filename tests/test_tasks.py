@@ -1,31 +1,33 @@
 from unittest import TestCase
 
-from tasks import SimpleTasks, Task
+from tasks import CompactTasks, SimpleTasks, Task
 from tasks.errors import UniqueViolationError, ConflictError
 
 
 class TestSimpleTasks(TestCase):
+    tasks_class = SimpleTasks
+
     def test_tasks_is_initialized_with_a_name(self):
-        self.assertTrue(SimpleTasks('work'))
+        self.assertTrue(self.tasks_class('work'))
 
     def test_tasks_is_empty_when_initialized(self):
-        tasks = SimpleTasks('work')
+        tasks = self.tasks_class('work')
         self.assertEqual(0, tasks.number_of_tasks)
 
     def test_tasks_add_gets_a_name_and_adds_a_task(self):
-        tasks = SimpleTasks('work')
+        tasks = self.tasks_class('work')
         tasks.add('tasks 1')
         self.assertEqual(1, tasks.number_of_tasks)
 
     def test_tasks_number_of_tasks_correctly_computes_number_of_tasks(self):
-        tasks = SimpleTasks('work')
+        tasks = self.tasks_class('work')
         self.assertEqual(0, tasks.number_of_tasks)
         for i in range(10):
             tasks.add(f'tasks {i}')
             self.assertEqual(1 + i, tasks.number_of_tasks)
 
     def test_tasks_all_returns_all_the_tasks_in_tasks(self):
-        tasks = SimpleTasks('work')
+        tasks = self.tasks_class('work')
         tasks.add('tasks 1')
         tasks.add('tasks 2')
         task_list = tasks.all()
@@ -35,16 +37,16 @@ class TestSimpleTasks(TestCase):
         self.assertEqual(task_list[1].name, 'tasks 2')
 
     def test_tasks_all_is_empty_when_initialized(self):
-        tasks = SimpleTasks('work')
+        tasks = self.tasks_class('work')
         self.assertEqual(0, len(tasks.all()))
 
     def test_tasks_add_raises_unique_violation_error_when_duplicate_task_is_added(self):
-        tasks = SimpleTasks('work')
+        tasks = self.tasks_class('work')
         tasks.add('tasks 1')
         self.assertRaises(UniqueViolationError, tasks.add, 'tasks 1')
 
     def test_tasks_getitem_accesses_a_task_in_tasks(self):
-        tasks = SimpleTasks('work')
+        tasks = self.tasks_class('work')
         tasks.add('tasks 1')
         tasks.add('tasks 2')
         tasks.add('tasks 3')
@@ -55,21 +57,21 @@ class TestSimpleTasks(TestCase):
         self.assertTrue(tasks['tasks 1'].done)
 
     def test_tasks_getitem_accesses_a_task_in_tasks_even_when_name_matches_partially_based_on_prefix(self):
-        tasks = SimpleTasks('work')
+        tasks = self.tasks_class('work')
         tasks.add('one task')
         tasks.add('two task')
         tasks.add('three task')
         self.assertEqual('two task', tasks['two'].name)
 
     def test_tasks_getitem_partial_match_raises_conflict_error_when_more_than_one_tasks_matches(self):
-        tasks = SimpleTasks('work')
+        tasks = self.tasks_class('work')
         tasks.add('one task')
         tasks.add('two task')
         tasks.add('three task')
         self.assertRaises(ConflictError, tasks.__getitem__, 't')
 
     def test_tasks_setitem_renames_task_correctly(self):
-        tasks = SimpleTasks('work')
+        tasks = self.tasks_class('work')
         tasks.add('tasks 1')
         tasks.add('tasks 2')
         tasks.add('tasks 3')
@@ -81,7 +83,7 @@ class TestSimpleTasks(TestCase):
         self.assertEqual('yet another name', tasks['yet another name'].name)
 
     def test_sort_by_name_sorts_correctly(self):
-        tasks = SimpleTasks('work')
+        tasks = self.tasks_class('work')
         tasks.add('tasks 2')
         tasks.add('tasks 1')
         tasks.add('tasks 3')
@@ -92,7 +94,7 @@ class TestSimpleTasks(TestCase):
         self.assertEqual(['tasks 3', 'tasks 2', 'tasks 1'], list(map(lambda i: i.name, tasks.all())))
 
     def test_sort_by_done_state_sorts_correctly(self):
-        tasks = SimpleTasks('work')
+        tasks = self.tasks_class('work')
         tasks.add('tasks 1')
         tasks.add('tasks 2')
         tasks.add('tasks 3')
@@ -106,28 +108,38 @@ class TestSimpleTasks(TestCase):
         self.assertEqual(['tasks 1', 'tasks 4', 'tasks 2', 'tasks 3'], list(map(lambda i: i.name, tasks.all())))
 
     def test_equality_works_correctly_for_tasks(self):
-        tasks1 = SimpleTasks('work')
+        tasks1 = self.tasks_class('work')
         tasks1.add('tasks 1')
         tasks1.add('tasks 2')
-        tasks2 = SimpleTasks('work')
+        tasks2 = self.tasks_class('work')
         tasks2.add('tasks 1')
         tasks2.add('tasks 2')
         self.assertEqual(tasks1, tasks2)
-        tasks3 = SimpleTasks('foobar')
+        tasks3 = self.tasks_class('foobar')
         self.assertNotEqual(tasks1, tasks3)
         tasks2['tasks 1'].finish()
         self.assertNotEqual(tasks1, tasks2)
 
     def test_has_looks_up_correctly(self):
-        tasks = SimpleTasks('work')
+        tasks = self.tasks_class('work')
         tasks.add('tasks 1')
         tasks.add('tasks 2')
         self.assertFalse(tasks.has('tasks 3'))
         self.assertTrue(tasks.has('tasks 2'))
         self.assertTrue(tasks.has('tasks 1'))
 
+    def test_position_is_the_index_in_insertion_order(self):
+        tasks = self.tasks_class('work')
+        tasks.extend((f'tasks {i}', False) for i in range(6))
+        tasks.delete('tasks 1')
+        tasks.delete('tasks 3')
+        tasks['tasks 5'] = 'a task'
+        self.assertEqual([0, 1, 2, 3], [tasks.position(task.name) for task in tasks.ordered()])
+        self.assertEqual(3, tasks.position('a task'))
+        self.assertRaises(KeyError, tasks.position, 'tasks 1')
+
     def test_delete_correctly_deletes_a_task(self):
-        tasks = SimpleTasks('work')
+        tasks = self.tasks_class('work')
         tasks.add('tasks 1')
         tasks.add('tasks 2')
         tasks.add('tasks 3')
@@ -140,7 +152,7 @@ class TestSimpleTasks(TestCase):
         self.assertTrue(tasks.has('tasks 3'))
 
     def test_delete_correctly_deletes_a_task_with_prefix_match(self):
-        tasks = SimpleTasks('work')
+        tasks = self.tasks_class('work')
         tasks.add('first task')
         tasks.add('second task')
         tasks.add('third task')
@@ -153,6 +165,183 @@ class TestSimpleTasks(TestCase):
         self.assertTrue(tasks.has('third task'))
 
     def test_delete_raises_lookup_error_when_task_not_present(self):
-        tasks = SimpleTasks('work')
+        tasks = self.tasks_class('work')
         tasks.add('tasks 1')
         self.assertRaises(LookupError, tasks.delete, 'tasks 2')
+
+    def test_setitem_updates_name_lookups(self):
+        tasks = self.tasks_class('work')
+        tasks.add('tasks 1')
+        tasks.add('tasks 2')
+        tasks['tasks 1'] = 'one task'
+        self.assertFalse(tasks.has('tasks 1'))
+        self.assertTrue(tasks.has('one task'))
+        self.assertEqual('tasks 2', tasks['tasks'].name)
+        self.assertEqual('one task', tasks['o'].name)
+
+    def test_setitem_raises_unique_violation_error_when_new_name_already_exists(self):
+        tasks = self.tasks_class('work')
+        tasks.add('tasks 1')
+        tasks.add('tasks 2')
+        self.assertRaises(UniqueViolationError, tasks.__setitem__, 'tasks 1', 'tasks 2')
+        self.assertEqual('tasks 1', tasks['tasks 1'].name)
+
+    def test_getitem_prefers_full_match_over_prefix_matches(self):
+        tasks = self.tasks_class('work')
+        tasks.add('task')
+        tasks.add('task 1')
+        tasks.add('task 2')
+        self.assertEqual('task', tasks['task'].name)
+        self.assertRaises(ConflictError, tasks.__getitem__, 'task ')
+
+    def test_getitem_prefix_match_is_resolved_after_deleting_a_conflicting_task(self):
+        tasks = self.tasks_class('work')
+        tasks.add('one task')
+        tasks.add('other task')
+        self.assertRaises(ConflictError, tasks.__getitem__, 'o')
+        tasks.delete('other')
+        self.assertEqual('one task', tasks['o'].name)
+        self.assertRaises(LookupError, tasks.__getitem__, 'other')
+
+    def test_window_returns_a_page_and_the_cursor_of_the_next_one(self):
+        tasks = self.tasks_class('work')
+        for i in range(10):
+            tasks.add(f'tasks {i}')
+        page, cursor = tasks.window(limit=4)
+        self.assertEqual(['tasks 0', 'tasks 1', 'tasks 2', 'tasks 3'], [task.name for task in page])
+        page, cursor = tasks.window(limit=4, cursor=cursor)
+        self.assertEqual(['tasks 4', 'tasks 5', 'tasks 6', 'tasks 7'], [task.name for task in page])
+        page, cursor = tasks.window(limit=4, cursor=cursor)
+        self.assertEqual(['tasks 8', 'tasks 9'], [task.name for task in page])
+        self.assertIsNone(cursor)
+        page, cursor = tasks.window(offset=3, limit=2)
+        self.assertEqual(['tasks 3', 'tasks 4'], [task.name for task in page])
+        self.assertEqual(5, cursor)
+        self.assertEqual(([], None), tasks.window(offset=20))
+
+    def test_window_skips_finished_tasks_when_only_unfinished(self):
+        tasks = self.tasks_class('work')
+        for i in range(10):
+            tasks.add(f'tasks {i}')
+            if i % 2:
+                tasks[f'tasks {i}'].finish()
+        page, cursor = tasks.window(limit=2, only_unfinished=True)
+        self.assertEqual(['tasks 0', 'tasks 2'], [task.name for task in page])
+        page, cursor = tasks.window(offset=1, limit=2, only_unfinished=True, cursor=cursor)
+        self.assertEqual(['tasks 6', 'tasks 8'], [task.name for task in page])
+        self.assertIsNone(cursor)
+
+    def test_stats_counts_finished_and_unfinished_tasks(self):
+        tasks = self.tasks_class('work')
+        self.assertEqual({'total': 0, 'finished': 0, 'unfinished': 0}, tasks.stats())
+        for i in range(5):
+            tasks.add(f'tasks {i}')
+        tasks['tasks 1'].finish()
+        tasks['tasks 3'].finish()
+        tasks['tasks 3'].finish()
+        self.assertEqual({'total': 5, 'finished': 2, 'unfinished': 3}, tasks.stats())
+        tasks['tasks 3'].undo()
+        tasks.delete('tasks 1')
+        tasks.delete('tasks 0')
+        self.assertEqual({'total': 3, 'finished': 0, 'unfinished': 3}, tasks.stats())
+
+    def test_finished_and_unfinished_iterate_in_task_order(self):
+        tasks = self.tasks_class('work')
+        for i in range(6):
+            tasks.add(f'tasks {i}')
+        tasks['tasks 4'].finish()
+        tasks['tasks 1'].finish()
+        tasks['tasks 2'].done = True
+        tasks['tasks 2'].undo()
+        self.assertEqual(['tasks 1', 'tasks 4'], [task.name for task in tasks.finished()])
+        self.assertEqual(['tasks 0', 'tasks 2', 'tasks 3', 'tasks 5'], [task.name for task in tasks.unfinished()])
+        tasks['tasks 0'].finish()
+        self.assertEqual(['tasks 0', 'tasks 1', 'tasks 4'], [task.name for task in tasks.finished()])
+
+    def test_deleted_task_is_no_longer_counted_when_finished(self):
+        tasks = self.tasks_class('work')
+        task = tasks.add('tasks 1')
+        tasks.delete('tasks 1')
+        task.finish()
+        self.assertEqual({'total': 0, 'finished': 0, 'unfinished': 0}, tasks.stats())
+
+    def test_sorted_views_keep_their_order_when_tasks_change(self):
+        tasks = self.tasks_class('work')
+        tasks.add('tasks 2')
+        tasks.add('tasks 1')
+        tasks.sort_by_name()
+        tasks.add('tasks 0')
+        tasks.add('tasks 3')
+        self.assertEqual(['tasks 0', 'tasks 1', 'tasks 2', 'tasks 3'], [task.name for task in tasks.all()])
+        tasks['tasks 0'] = 'tasks 9'
+        tasks.delete('tasks 1')
+        self.assertEqual(['tasks 2', 'tasks 3', 'tasks 9'], [task.name for task in tasks.all()])
+        tasks.sort_by_done_state()
+        tasks['tasks 2'].finish()
+        self.assertEqual(['tasks 9', 'tasks 3', 'tasks 2'], [task.name for task in tasks.all()])
+
+    def test_ordered_keeps_insertion_order_as_the_canonical_order(self):
+        tasks = self.tasks_class('work')
+        for name in ['tasks 2', 'tasks 3', 'tasks 1']:
+            tasks.add(name)
+        tasks['tasks 3'].finish()
+        tasks.sort_by_name(desc=True)
+        self.assertEqual(['tasks 2', 'tasks 3', 'tasks 1'], [task.name for task in tasks.ordered()])
+        self.assertEqual(['tasks 1', 'tasks 3', 'tasks 2'], [task.name for task in tasks.ordered(desc=True)])
+        self.assertEqual(['tasks 1', 'tasks 2', 'tasks 3'], [task.name for task in tasks.ordered('name')])
+        self.assertEqual(['tasks 3', 'tasks 2', 'tasks 1'], [task.name for task in tasks.ordered('done', True)])
+        self.assertRaises(ValueError, tasks.ordered, 'size')
+
+    def test_window_pages_through_a_sorted_view(self):
+        tasks = self.tasks_class('work')
+        for name in ['tasks 2', 'tasks 3', 'tasks 1', 'tasks 0']:
+            tasks.add(name)
+        tasks['tasks 1'].finish()
+        page, cursor = tasks.window(limit=2, by='name', desc=True)
+        self.assertEqual(['tasks 3', 'tasks 2'], [task.name for task in page])
+        page, cursor = tasks.window(limit=2, by='name', desc=True, cursor=cursor, only_unfinished=True)
+        self.assertEqual(['tasks 0'], [task.name for task in page])
+        self.assertIsNone(cursor)
+
+    def test_extend_adds_records_in_one_pass_and_reports_every_duplicate(self):
+        tasks = self.tasks_class.from_records('work', [('tasks 2', False), ('tasks 0', True)])
+        added = tasks.extend([('tasks 1', True), ('tasks 3', False)])
+        self.assertEqual(['tasks 1', 'tasks 3'], [task.name for task in added])
+        self.assertEqual(['tasks 2', 'tasks 0', 'tasks 1', 'tasks 3'], [task.name for task in tasks.all()])
+        self.assertEqual(['tasks 0', 'tasks 1'], [task.name for task in tasks.finished()])
+        self.assertEqual('tasks 3', tasks['tasks 3'].name)
+        with self.assertRaises(UniqueViolationError) as context:
+            tasks.extend([('tasks 4', False), ('tasks 0', False), ('tasks 5', False), ('tasks 4', True)])
+        self.assertEqual(['tasks 0', 'tasks 4'], context.exception.names)
+        self.assertEqual(4, tasks.number_of_tasks)
+        self.assertFalse(tasks.has('tasks 5'))
+
+
+class TestSimpleTasksSnapshot(TestCase):
+    def test_simple_tasks_round_trips_through_a_snapshot(self):
+        tasks = SimpleTasks('work')
+        for name in ['tasks 2', 'tasks 0', 'tasks 1']:
+            tasks.add(name)
+        tasks['tasks 0'].finish()
+        restored = SimpleTasks.from_snapshot('work', *tasks.snapshot())
+        self.assertEqual(tasks, restored)
+        self.assertEqual(['tasks 0'], [task.name for task in restored.finished()])
+        restored['tasks 2'].finish()
+        restored.add('tasks 3')
+        self.assertEqual(['tasks 1', 'tasks 3'], [task.name for task in restored.unfinished()])
+        self.assertEqual('tasks 1', restored['tasks 1'].name)
+
+
+class TestCompactTasks(TestSimpleTasks):
+    tasks_class = CompactTasks
+
+    def test_compact_tasks_reclaims_deleted_slots(self):
+        tasks = self.tasks_class('work')
+        for i in range(6):
+            tasks.add(f'tasks {i}')
+        tasks['tasks 4'].finish()
+        for i in range(4):
+            tasks.delete(f'tasks {i}')
+        self.assertEqual(2, len(tasks._names))
+        self.assertEqual(['tasks 5', 'tasks 4'], [task.name for task in tasks.ordered('done')])
+        self.assertEqual(['tasks 5'], [task.name for task in tasks.window(cursor=1)[0]])
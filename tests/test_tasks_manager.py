@@ -1,9 +1,13 @@
+import tempfile
+from multiprocessing import Pool
 from unittest import TestCase
 
 from manager.manager import SimpleTasksManager
+from storage import SimpleJsonStorageFactory, SqliteStorageFactory
 from storage.io import IO
 from storage.parser import SimpleJsonParser
-from storage.storage import Storage
+from storage.cache import GroupCache
+from storage.storage import CachedStorage, Storage
 from tasks import SimpleTasks
 from tasks.errors import UniqueViolationError
 
@@ -24,6 +28,30 @@ class MockIO(IO):
         return '.foo'
 
 
+def add_entries_in_a_separate_process(storage_path: str, worker: int, factory=SimpleJsonStorageFactory):
+    tasks_manager = SimpleTasksManager('work', factory.create(storage_path))
+    for i in range(10):
+        tasks_manager.add_entry(f'job {worker}-{i}')
+
+
+class RecordingStorage(Storage):
+    def __init__(self):
+        super().__init__(SimpleJsonParser(), MockIO(), '.')
+        self.calls = []
+
+    def put_task(self, tasks, task_name: str):
+        self.calls.append(('put_task', task_name))
+        super().put_task(tasks, task_name)
+
+    def rename_task(self, tasks, task_name: str, new_name: str):
+        self.calls.append(('rename_task', task_name, new_name))
+        super().rename_task(tasks, task_name, new_name)
+
+    def delete_task(self, tasks, task_name: str):
+        self.calls.append(('delete_task', task_name))
+        super().delete_task(tasks, task_name)
+
+
 class TestTasksManager(TestCase):
     def setUp(self) -> None:
         self.storage = Storage(SimpleJsonParser(), MockIO(), '.')
@@ -75,6 +103,15 @@ class TestTasksManager(TestCase):
         tasks_manager.add_entry('job 1')
         self.assertRaises(UniqueViolationError, tasks_manager.add_entry, 'job 1')
 
+    def test_manager_add_entries_adds_all_entries_or_reports_every_duplicate(self):
+        tasks_manager = SimpleTasksManager('work', self.storage)
+        tasks_manager.add_entries(['job 1', 'job 2'])
+        self.assertEqual(['job 1', 'job 2'], [task['name'] for task in file['./work.foo']['tasks']])
+        with self.assertRaises(UniqueViolationError) as context:
+            tasks_manager.add_entries(['job 3', 'job 2', 'job 1'])
+        self.assertEqual(['job 1', 'job 2'], context.exception.names)
+        self.assertEqual(2, len(file['./work.foo']['tasks']))
+
     def test_manager_edit_renames_task_correctly(self):
         tasks_manager = SimpleTasksManager('work', self.storage)
         tasks_manager.add_entry('job 1')
@@ -107,6 +144,124 @@ class TestTasksManager(TestCase):
         saved_jobs = [file['./work.foo']['tasks'][i]['name'] for i in range(len(file['./work.foo']['tasks']))]
         self.assertEqual(['one job', 'three job'], saved_jobs)
 
+    def test_manager_persists_only_the_changed_entry_with_its_full_name(self):
+        storage = RecordingStorage()
+        tasks_manager = SimpleTasksManager('work', storage)
+        tasks_manager.add_entry('one job')
+        tasks_manager.finish_entry('one job')
+        tasks_manager.undo_entry('one job')
+        tasks_manager.edit_entry('one', 'first job')
+        tasks_manager.delete_entry('first')
+        expected = [
+            ('put_task', 'one job'),
+            ('put_task', 'one job'),
+            ('put_task', 'one job'),
+            ('rename_task', 'one job', 'first job'),
+            ('delete_task', 'first job'),
+        ]
+        self.assertEqual(expected, storage.calls)
+
+    def test_manager_reuses_the_loaded_group_until_the_file_changes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            storage = SimpleJsonStorageFactory.create(directory)
+            loads = []
+            get = storage.get
+            storage.get = lambda tasks_name: loads.append(tasks_name) or get(tasks_name)
+            tasks_manager = SimpleTasksManager('work', storage)
+            tasks_manager.add_entry('job 1')
+            loads.clear()
+            tasks_manager.finish_entry('job 1')
+            tasks_manager.edit_entry('job 1', 'one job')
+            self.assertEqual([], loads)
+            SimpleTasksManager('work', SimpleJsonStorageFactory.create(directory)).add_entry('job 2')
+            tasks_manager.delete_entry('one job')
+            self.assertEqual(['work'], loads)
+            self.assertEqual(['job 2'], [task.name for task in get('work').all()])
+
+    def test_managers_of_the_same_group_do_not_deadlock_in_one_process(self):
+        with tempfile.TemporaryDirectory() as directory:
+            storage = SimpleJsonStorageFactory.create(directory)
+            tasks_manager = SimpleTasksManager('work', storage)
+            with tasks_manager.transaction():
+                SimpleTasksManager('work', storage).add_entry('job 1')
+                tasks_manager.add_entry('job 2')
+            self.assertEqual(2, storage.get('work').number_of_tasks)
+
+    def test_manager_does_not_lose_entries_added_by_parallel_processes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with Pool(4) as pool:
+                pool.starmap(add_entries_in_a_separate_process, [(directory, worker) for worker in range(4)])
+            tasks = SimpleTasksManager('work', SimpleJsonStorageFactory.create(directory)).retrieve()
+            self.assertEqual(40, tasks.number_of_tasks)
+
+    def test_manager_does_not_lose_sqlite_rows_added_by_parallel_processes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with Pool(4) as pool:
+                pool.starmap(add_entries_in_a_separate_process, [
+                    (directory, worker, SqliteStorageFactory) for worker in range(4)
+                ])
+            tasks = SimpleTasksManager('work', SqliteStorageFactory.create(directory)).retrieve()
+            self.assertEqual(40, tasks.number_of_tasks)
+
     def tearDown(self) -> None:
         global file
         file = {}
+
+
+class TestTasksManagerTransaction(TestCase):
+    def setUp(self) -> None:
+        self.storage = RecordingStorage()
+
+    def test_transaction_persists_all_changes_once_on_commit(self):
+        tasks_manager = SimpleTasksManager('work', self.storage)
+        with tasks_manager.transaction():
+            tasks_manager.add_entry('job 1')
+            tasks_manager.add_entry('job 2')
+            tasks_manager.finish_entry('job 1')
+            tasks_manager.edit_entry('job 2', 'second job')
+            self.assertEqual([], file['./work.foo']['tasks'])
+        self.assertEqual([], self.storage.calls)
+        expected = {'group': 'work', 'tasks': [{'done': True, 'name': 'job 1'}, {'done': False, 'name': 'second job'}]}
+        self.assertEqual(expected, file['./work.foo'])
+
+    def test_transaction_discards_all_changes_on_exception(self):
+        tasks_manager = SimpleTasksManager('work', self.storage)
+        tasks_manager.add_entry('job 1')
+        with self.assertRaises(UniqueViolationError):
+            with tasks_manager.transaction():
+                tasks_manager.finish_entry('job 1')
+                tasks_manager.add_entry('job 2')
+                tasks_manager.add_entry('job 2')
+        self.assertEqual({'group': 'work', 'tasks': [{'done': False, 'name': 'job 1'}]}, file['./work.foo'])
+        self.assertFalse(tasks_manager.retrieve().has('job 2'))
+        self.assertFalse(tasks_manager.retrieve()['job 1'].done)
+
+    def test_transaction_rollback_drops_the_cached_group(self):
+        with tempfile.TemporaryDirectory() as directory:
+            storage = CachedStorage(SimpleJsonStorageFactory.create(directory), GroupCache())
+            tasks_manager = SimpleTasksManager('work', storage)
+            tasks_manager.add_entry('job 1')
+            with self.assertRaises(UniqueViolationError):
+                with tasks_manager.transaction():
+                    tasks_manager.add_entry('job 2')
+                    tasks_manager.add_entry('job 1')
+            self.assertFalse(SimpleTasksManager('work', storage).retrieve().has('job 2'))
+
+    def test_transaction_does_not_write_when_nothing_changed(self):
+        tasks_manager = SimpleTasksManager('work', self.storage)
+        tasks_manager.add_entry('job 1')
+        self.storage.io.save_to = None
+        with tasks_manager.transaction():
+            tasks_manager.get_entry_full_name('job')
+
+    def test_nested_transactions_are_committed_by_the_outermost_one(self):
+        tasks_manager = SimpleTasksManager('work', self.storage)
+        with tasks_manager.transaction():
+            with tasks_manager.transaction():
+                tasks_manager.add_entry('job 1')
+            self.assertEqual([], file['./work.foo']['tasks'])
+            tasks_manager.add_entry('job 2')
+        self.assertEqual(2, len(file['./work.foo']['tasks']))
+
+    def tearDown(self) -> None:
+        file.clear()